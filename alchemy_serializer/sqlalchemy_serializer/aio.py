@@ -0,0 +1,221 @@
+# coding: utf-8
+"""
+Asyncio support.
+
+Requires python 3.7+ and SQLAlchemy 1.4+(sqlalchemy.ext.asyncio).
+"""
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from . import settings
+from .decorators import _Ambient, _Scope
+
+_engine = None
+_session_factory = None
+
+
+def get_async_engine():
+    """
+    Return async engine, create it on first call.
+
+    :rtype: sqlalchemy.ext.asyncio.AsyncEngine
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(settings.ASYNC_CONNECTION_STRING)
+    return _engine
+
+
+def create_async_session():
+    """
+    Create sqlalchemy async session.
+    Session is async context manager, that closes session on exit.
+
+    >>> async with create_async_session() as session:
+    >>>     await do_smth(session)
+
+    :rtype: sqlalchemy.ext.asyncio.AsyncSession
+    :return: new session
+    """
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(
+            get_async_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+    return _session_factory()
+
+
+def async_sessioned(session_builder_manager, ambient=None):
+    """
+    Session decorator for coroutine functions.
+    Wraps coroutine in async session context manager.
+    Delegates session and commit args to func.
+
+    Has the same unit of work semantics and reserved savepoint argument
+    as decorators.sessioned, scope is async context manager:
+
+    .. code:: python
+
+        async with sessioned.scope(commit=True) as session:
+            await add_guilds(names)
+            await add_members(names)
+
+    :param session_builder_manager:
+        factory of async session context managers
+    :param ambient: current scope
+
+    :rtype: function
+    """
+    if ambient is None:
+        ambient = _Ambient()
+
+    @asynccontextmanager
+    async def scope(commit=None):
+        """
+        Share session with nested sessioned calls.
+
+        :param bool commit: if True: commit on exit
+
+        :rtype: sqlalchemy.ext.asyncio.AsyncSession
+        """
+        current = ambient.get()
+        if current is not None:
+            if commit:
+                current.commit = True
+            yield current.session
+            return
+
+        async with session_builder_manager() as session:
+            current = _Scope(session, commit=bool(commit))
+            token = ambient.set(current)
+            try:
+                yield session
+                if current.commit:
+                    await session.commit()
+            finally:
+                ambient.reset(token)
+
+    async def call(func, session, savepoint, args, kwargs):
+        if not savepoint:
+            return await func(*args, **kwargs)
+        async with session.begin_nested():
+            return await func(*args, **kwargs)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            session = kwargs.get('session', None)
+            commit = kwargs.get('commit', None)
+            savepoint = kwargs.pop('savepoint', False)
+
+            if session is not None:
+                if ambient.get() is not None:
+                    result = await call(
+                        func, session, savepoint, args, kwargs
+                    )
+                    if commit and not ambient.request_commit(session):
+                        await session.commit()
+                    return result
+
+                current = _Scope(session, commit=bool(commit))
+                token = ambient.set(current)
+                try:
+                    result = await call(func, session, savepoint, args, kwargs)
+                finally:
+                    ambient.reset(token)
+                if current.commit:
+                    await session.commit()
+                return result
+
+            if commit is False and ambient.get() is None:
+                raise ValueError(
+                    "Commit can't be False when session is None"
+                )
+            async with scope(commit=commit) as session:
+                kwargs['session'] = session
+                return await call(func, session, savepoint, args, kwargs)
+        return wrapper
+
+    decorator.scope = scope
+    return decorator
+
+
+sessioned = async_sessioned(create_async_session)
+
+
+def _selects_entity(statement):
+    descriptions = statement.column_descriptions
+    return (
+        len(descriptions) == 1 and
+        descriptions[0]['expr'] is descriptions[0]['entity']
+    )
+
+
+async def aiter_dicts(
+    serializer, session, statement=None, chunk_size=1000, chunked=False,
+    custom_args=(), custom_kwargs=None
+):
+    """
+    Lazily serialize results of statement, executed by async session.
+    Results are streamed with server side cursor and serialized by chunks,
+    control is given back to event loop between chunks.
+
+    .. code:: python
+
+        async with create_async_session() as session:
+            async for data in aiter_dicts(serializator, session):
+                await export(data)
+
+    :param SQLAlchemySerializator serializer:
+    :param sqlalchemy.ext.asyncio.AsyncSession session:
+    :param statement:
+        select statement
+        - if None: selects serializer fields,
+            or model with load options if serializer has nested fields,
+            see SQLAlchemyModelSerializator.build_query(stream=True)
+    :param int chunk_size: count of raws fetched at a time
+    :param bool chunked: if True: yield lists of dicts instead of dicts
+
+    :param tuple custom_args:
+        will be dispatched to custom_field functions
+    :param dict custom_kwargs:
+        will be dispatched to custom_field functions
+
+    :rtype: async generator
+    """
+    if statement is None:
+        if getattr(serializer, 'nested_serialize_fields', None):
+            statement = select(serializer.model)
+            for relationship in serializer.get_eager_joins(stream=True):
+                statement = statement.outerjoin(relationship)
+            statement = statement.options(
+                *serializer.get_load_options(stream=True)
+            )
+        else:
+            statement = select(*serializer.get_query_fields())
+    custom_kwargs = custom_kwargs or {}
+
+    entity = _selects_entity(statement)
+    result = await session.stream(
+        statement.execution_options(yield_per=chunk_size)
+    )
+    if entity:
+        result = result.scalars()
+
+    async for raws in result.partitions(chunk_size):
+        if not entity:
+            raws = [tuple(raw) for raw in raws]
+        chunk = serializer.to_dicts(raws, *custom_args, **custom_kwargs)
+        if chunked:
+            yield chunk
+        else:
+            for data in chunk:
+                yield data
+        await asyncio.sleep(0)
@@ -0,0 +1,220 @@
+# coding: utf-8
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+
+_missing = object()
+
+
+class LRUCache(object):
+    """
+    Thread-safe bounded LRU cache with optional time to live.
+
+    :param int maxsize: max count of entries
+    :param float ttl:
+        entry time to live in seconds
+        - if None: entries do not expire
+    """
+    def __init__(self, maxsize=1024, ttl=None, timer=time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, _missing)
+            if entry is _missing:
+                return default
+            value, expires = entry
+            if expires is not None and expires < self.timer():
+                return default
+            self._data[key] = entry
+            return value
+
+    def set(self, key, value):
+        expires = None
+        if self.ttl is not None:
+            expires = self.timer() + self.ttl
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, expires)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, _missing)
+        if entry is _missing:
+            return default
+        return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def keys(self):
+        """
+        :rtype: list
+        :return: snapshot of keys
+        """
+        with self._lock:
+            return list(self._data)
+
+
+class SerializationCache(object):
+    """
+    Cache of serialized model instances.
+
+    Entries are keyed by instance identity and serializer,
+    and are valid while version of instance is not changed.
+    Instances with modified or expired attributes are not cached.
+    Use listen() to drop entries of flushed instances
+    and of models changed by bulk updates and deletes.
+
+    .. code:: python
+
+        cache = SerializationCache(maxsize=10000, ttl=60, version_key='updated_on')
+        cache.listen(Session)
+
+        serializer = UserSerializator(cache=cache)
+
+    :param int maxsize: max count of cached instances
+    :param float ttl: entry time to live in seconds
+    :param str version_key:
+        instance attribute, that is changed on each update
+        - if None: entries are dropped only by session events and ttl
+    """
+    def __init__(self, maxsize=1024, ttl=None, version_key=None):
+        self.version_key = version_key
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get_identity(self, instance):
+        state = inspect(instance)
+        identity = state.identity_key
+        if identity is None or state.modified or state.expired_attributes:
+            return None, None
+        version = None
+        if self.version_key is not None:
+            version = getattr(instance, self.version_key)
+        return identity, version
+
+    def get(self, instance, token):
+        """
+        Return cached dict of instance.
+
+        :param instance: model instance
+        :param token: serializer cache token
+
+        :rtype: dict|None
+        :return: None if there is no valid entry
+        """
+        identity, version = self._get_identity(instance)
+        if identity is None:
+            return None
+        entries = self._entries.get(identity)
+        if not entries:
+            return None
+        entry = entries.get(token)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def set(self, instance, token, data):
+        """
+        Cache dict of instance.
+
+        :param instance: model instance
+        :param token: serializer cache token
+        :param dict data: serialized instance
+        """
+        identity, version = self._get_identity(instance)
+        if identity is None:
+            return
+        entries = self._entries.get(identity) or {}
+        entries = dict(entries)
+        entries[token] = (version, data)
+        self._entries.set(identity, entries)
+
+    def invalidate(self, instance):
+        """
+        Drop cached dicts of instance.
+
+        :param instance: model instance
+        """
+        self.invalidate_key(inspect(instance).identity_key)
+
+    def invalidate_key(self, identity):
+        """
+        Drop cached dicts of instance with identity key.
+
+        :param tuple identity: instance identity key
+        """
+        if identity is not None:
+            self._entries.pop(identity)
+
+    def invalidate_model(self, model):
+        """
+        Drop cached dicts of all instances of model.
+
+        :param model: mapped class
+        """
+        identity_class = inspect(model).base_mapper.class_
+        for identity in self._entries.keys():
+            if identity[0] is identity_class:
+                self._entries.pop(identity)
+
+    def clear(self):
+        self._entries.clear()
+
+    def listen(self, target):
+        """
+        Drop entries of changed instances on session events.
+
+        Entries are dropped after flush, and once more
+        after commit or rollback, because instances could be serialized
+        with not committed state in between.
+        Query.update and Query.delete drop entries of the whole model.
+
+        :param target: Session class, sessionmaker or session
+        """
+        event.listen(target, 'after_flush', self._after_flush)
+        event.listen(target, 'after_commit', self._after_transaction)
+        event.listen(target, 'after_soft_rollback', self._after_rollback)
+        event.listen(target, 'after_bulk_update', self._after_bulk)
+        event.listen(target, 'after_bulk_delete', self._after_bulk)
+
+    def _after_flush(self, session, flush_context):
+        pending = session.info.setdefault(self._info_key, set())
+        for instance in list(session.dirty) + list(session.deleted):
+            identity = inspect(instance).identity_key
+            if identity is not None:
+                pending.add(identity)
+                self._entries.pop(identity)
+
+    def _after_transaction(self, session):
+        for identity in session.info.pop(self._info_key, ()):
+            self._entries.pop(identity)
+
+    def _after_rollback(self, session, previous_transaction):
+        self._after_transaction(session)
+
+    def _after_bulk(self, context):
+        mapper = getattr(context, 'mapper', None)
+        if mapper is None:
+            self.clear()
+        else:
+            self.invalidate_model(mapper.class_)
+
+    @property
+    def _info_key(self):
+        return ('sqlalchemy_serializer.cache', id(self))
@@ -0,0 +1,163 @@
+# coding: utf-8
+"""
+Built-in serialize functions, chosen by column type.
+"""
+import base64
+import datetime
+import decimal
+import uuid
+
+from sqlalchemy.types import JSON, LargeBinary
+
+try:
+    import enum
+except ImportError:
+    # python 2 without enum34
+    enum = None
+
+
+def serialize_isoformat(value):
+    return None if value is None else value.isoformat()
+
+
+def serialize_str(value):
+    return None if value is None else str(value)
+
+
+def serialize_enum(value):
+    return None if value is None else value.value
+
+
+def serialize_base64(value):
+    if value is None:
+        return None
+    return base64.b64encode(value).decode('ascii')
+
+
+def _strptime(value, formats):
+    for value_format in formats:
+        try:
+            return datetime.datetime.strptime(value, value_format)
+        except ValueError:
+            pass
+    raise ValueError('Invalid isoformat string: {!r}'.format(value))
+
+
+def deserialize_datetime(value):
+    if value is None:
+        return None
+    fromisoformat = getattr(datetime.datetime, 'fromisoformat', None)
+    if fromisoformat is not None:
+        return fromisoformat(value)
+    return _strptime(value, ('%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S'))
+
+
+def deserialize_date(value):
+    if value is None:
+        return None
+    return _strptime(value, ('%Y-%m-%d',)).date()
+
+
+def deserialize_time(value):
+    if value is None:
+        return None
+    fromisoformat = getattr(datetime.time, 'fromisoformat', None)
+    if fromisoformat is not None:
+        return fromisoformat(value)
+    return _strptime(value, ('%H:%M:%S.%f', '%H:%M:%S')).time()
+
+
+def deserialize_decimal(value):
+    return None if value is None else decimal.Decimal(value)
+
+
+def deserialize_uuid(value):
+    return None if value is None else uuid.UUID(value)
+
+
+def deserialize_base64(value):
+    if value is None:
+        return None
+    return base64.b64decode(value)
+
+
+def _build_enum_deserializer(enum_class):
+    def deserialize_enum(value):
+        return None if value is None else enum_class(value)
+
+    return deserialize_enum
+
+
+# python type: (serialize function, builder of deserialize function)
+PYTHON_TYPE_CONVERTERS = {
+    datetime.datetime: (
+        serialize_isoformat, lambda python_type: deserialize_datetime
+    ),
+    datetime.date: (serialize_isoformat, lambda python_type: deserialize_date),
+    datetime.time: (serialize_isoformat, lambda python_type: deserialize_time),
+    decimal.Decimal: (
+        serialize_str, lambda python_type: deserialize_decimal
+    ),
+    uuid.UUID: (serialize_str, lambda python_type: deserialize_uuid),
+}
+if enum is not None:
+    PYTHON_TYPE_CONVERTERS[enum.Enum] = (
+        serialize_enum, _build_enum_deserializer
+    )
+
+
+def _get_converters(column_type):
+    """
+    Return converters of values of column type.
+
+    :param sqlalchemy.types.TypeEngine column_type:
+
+    :rtype: tuple
+    :return: (serialize function, deserialize function),
+        (None, None) if values are passed as is
+    """
+    if column_type is None or isinstance(column_type, JSON):
+        return None, None
+    if isinstance(column_type, LargeBinary):
+        return serialize_base64, deserialize_base64
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        return None, None
+    for cls in getattr(python_type, '__mro__', ()):
+        converters = PYTHON_TYPE_CONVERTERS.get(cls)
+        if converters is not None:
+            serialize, build_deserialize = converters
+            return serialize, build_deserialize(python_type)
+    return None, None
+
+
+def get_type_converter(column_type):
+    """
+    Return serialize function for values of column type.
+
+    Converter is chosen by python type of column values:
+        - datetime, date, time: isoformat string
+        - Decimal, UUID: string
+        - Enum with enum class: enum value
+    LargeBinary values are encoded as base64 string,
+    JSON values are passed as is.
+
+    :param sqlalchemy.types.TypeEngine column_type:
+
+    :rtype: function|None
+    :return: None if values are passed as is
+    """
+    return _get_converters(column_type)[0]
+
+
+def get_type_deserializer(column_type):
+    """
+    Return inverse of get_type_converter for values of column type.
+
+    :param sqlalchemy.types.TypeEngine column_type:
+
+    :rtype: function|None
+    :return: None if values are passed as is
+    """
+    return _get_converters(column_type)[1]
@@ -1,4 +1,81 @@
 # coding: utf-8
+import inspect
+import threading
+from contextlib import contextmanager
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    # python 2
+    ContextVar = None
+
+
+def _is_coroutine_function(func):
+    iscoroutinefunction = getattr(inspect, 'iscoroutinefunction', None)
+    return iscoroutinefunction is not None and iscoroutinefunction(func)
+
+
+class _Scope(object):
+    """
+    Unit of work of nested sessioned calls.
+
+    :param session: shared session
+    """
+    def __init__(self, session, commit=False):
+        self.session = session
+        self.commit = commit
+
+
+class _Ambient(object):
+    """
+    Current scope of sessioned calls.
+    Is context-local with contextvars, else thread-local.
+    """
+    def __init__(self):
+        if ContextVar is not None:
+            self._var = ContextVar('sessioned_scope', default=None)
+        else:
+            self._local = threading.local()
+
+    def get(self):
+        """
+        :rtype: _Scope|None
+        """
+        if ContextVar is not None:
+            return self._var.get()
+        return getattr(self._local, 'scope', None)
+
+    def set(self, scope):
+        """
+        Set current scope.
+
+        :param _Scope scope:
+        :return: token to reset previous scope
+        """
+        if ContextVar is not None:
+            return self._var.set(scope)
+        previous = self.get()
+        self._local.scope = scope
+        return previous
+
+    def reset(self, token):
+        if ContextVar is not None:
+            self._var.reset(token)
+        else:
+            self._local.scope = token
+
+    def request_commit(self, session):
+        """
+        Defer commit of session to the outermost scope.
+
+        :rtype: bool
+        :return: False if session is not shared by scope
+        """
+        scope = self.get()
+        if scope is None or scope.session is not session:
+            return False
+        scope.commit = True
+        return True
 
 
 def sessioned(session_builder_manager):
@@ -6,38 +83,107 @@ def sessioned(session_builder_manager):
     Session decorator.
     Wraps function in a session context manager.
     Delegates session and commit args to func.
+    Args are read from call keyword arguments,
+    so defaults of func should be session=None, commit=None.
+
+    Nested decorated calls without session arg reuse session
+    of the outermost call(created or passed to it),
+    their commits are deferred and made once by the outermost call.
+    To make unit of work of several calls, use scope:
+
+    .. code:: python
+
+        with sessioned.scope(commit=True) as session:
+            for name in names:
+                guild.add_member(name=name, commit=True)
+        # one commit
+
+    Pass savepoint=True to run call in nested transaction(SAVEPOINT),
+    so its changes are rolled back on error without the whole scope.
+    savepoint keyword argument is reserved by decorator
+    and is not passed to func.
+
+    Coroutine functions are not supported, see aio.async_sessioned.
 
     :param session_builder_manager:
         session context_manager
-    :type arg1:
 
     :rtype: function
     """
+    ambient = _Ambient()
+
+    @contextmanager
+    def scope(commit=None):
+        """
+        Share session with nested sessioned calls.
+
+        :param bool commit: if True: commit on exit
+
+        :rtype: sqlalchemy.orm.session.Session
+        """
+        current = ambient.get()
+        if current is not None:
+            if commit:
+                current.commit = True
+            yield current.session
+            return
+
+        with session_builder_manager() as session:
+            current = _Scope(session, commit=bool(commit))
+            token = ambient.set(current)
+            try:
+                yield session
+                if current.commit:
+                    session.commit()
+            finally:
+                ambient.reset(token)
+
+    def call(func, session, savepoint, args, kwargs):
+        if not savepoint:
+            return func(*args, **kwargs)
+        with session.begin_nested():
+            return func(*args, **kwargs)
+
     def decorator(func):
+        if _is_coroutine_function(func):
+            raise TypeError(
+                'Use aio.async_sessioned for coroutine function {}'.format(
+                    func.__name__
+                )
+            )
+
         def wrapper(
             *args, **kwargs
         ):
             session = kwargs.get('session', None)
             commit = kwargs.get('commit', None)
+            savepoint = kwargs.pop('savepoint', False)
 
-            if session is None:
-                if commit is False:
-                    raise ValueError(
-                        "Commit can't be False when session is None"
-                    )
-                with session_builder_manager() as session:
-                    kwargs['session'] = session
-                    result = func(
-                        *args, **kwargs
-                    )
-            else:
-                result = func(
-                    *args, **kwargs
-                )
+            if session is not None:
+                if ambient.get() is not None:
+                    result = call(func, session, savepoint, args, kwargs)
+                    if commit and not ambient.request_commit(session):
+                        session.commit()
+                    return result
 
-            if commit:
-                session.commit()
+                current = _Scope(session, commit=bool(commit))
+                token = ambient.set(current)
+                try:
+                    result = call(func, session, savepoint, args, kwargs)
+                finally:
+                    ambient.reset(token)
+                if current.commit:
+                    session.commit()
+                return result
 
-            return result
+            if commit is False and ambient.get() is None:
+                raise ValueError(
+                    "Commit can't be False when session is None"
+                )
+            with scope(commit=commit) as session:
+                kwargs['session'] = session
+                return call(func, session, savepoint, args, kwargs)
         return wrapper
+
+    decorator.scope = scope
     return decorator
@@ -0,0 +1,120 @@
+# coding: utf-8
+from sqlalchemy import event
+
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+
+
+class DeltaCollector(object):
+    """
+    Collector of changes of flushed instances.
+
+    On each flush new instances are serialized whole,
+    changed instances are serialized with to_delta
+    and deleted instances with to_identity.
+    Instances of models without registered serializer are skipped.
+
+    .. code:: python
+
+        collector = DeltaCollector(registry)
+        collector.listen(Session)
+
+        guild.gold += 100
+        session.commit()
+        for model, operation, data in collector.pop(session):
+            publish(model.__tablename__, operation, data)
+
+    :param SerializerRegistry registry: serializers of models
+    """
+    def __init__(self, registry):
+        self.registry = registry
+
+    def listen(self, target):
+        """
+        Collect deltas on session events.
+        Deltas flushed in rolled back transaction are dropped,
+        rolled back savepoint drops only deltas flushed inside of it.
+
+        :param target: Session class, sessionmaker or session
+        """
+        event.listen(target, 'after_flush', self._after_flush)
+        event.listen(target, 'after_soft_rollback', self._after_rollback)
+
+    def pop(self, session):
+        """
+        Return collected deltas of session and clear them.
+
+        :param sqlalchemy.orm.Session session:
+
+        :rtype: list
+        :return: (model, operation, dict) tuples in order of flushes
+        """
+        return [
+            delta for transaction, delta
+            in session.info.pop(self._info_key, [])
+        ]
+
+    def _after_flush(self, session, flush_context):
+        find = self.registry.find
+        transaction = _get_transaction(session)
+        deltas = []
+
+        new = [
+            instance for instance in session.new
+            if find(instance.__class__) is not None
+        ]
+        for instance, data in zip(new, self.registry.to_dicts(new)):
+            deltas.append((instance.__class__, INSERT, data))
+
+        for instance in session.dirty:
+            serializer = find(instance.__class__)
+            if serializer is None:
+                continue
+            data = serializer.to_delta(instance)
+            if data is not None:
+                deltas.append((instance.__class__, UPDATE, data))
+
+        for instance in session.deleted:
+            serializer = find(instance.__class__)
+            if serializer is not None:
+                deltas.append((
+                    instance.__class__, DELETE,
+                    serializer.to_identity(instance)
+                ))
+
+        session.info.setdefault(self._info_key, []).extend(
+            (transaction, delta) for delta in deltas
+        )
+
+    def _after_rollback(self, session, previous_transaction):
+        if not previous_transaction.nested:
+            session.info.pop(self._info_key, None)
+            return
+
+        deltas = session.info.get(self._info_key)
+        if deltas:
+            deltas[:] = [
+                (transaction, delta) for transaction, delta in deltas
+                if not _is_within(transaction, previous_transaction)
+            ]
+
+    @property
+    def _info_key(self):
+        return ('sqlalchemy_serializer.delta', id(self))
+
+
+def _get_transaction(session):
+    # Session.transaction is deprecated since SQLAlchemy 1.4
+    try:
+        return session._transaction
+    except AttributeError:
+        return session.transaction
+
+
+def _is_within(transaction, parent):
+    while transaction is not None:
+        if transaction is parent:
+            return True
+        transaction = transaction.parent
+    return False
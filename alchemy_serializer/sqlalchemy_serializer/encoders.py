@@ -0,0 +1,156 @@
+# coding: utf-8
+import datetime
+import decimal
+import json
+import math
+from json.encoder import encode_basestring_ascii
+
+try:
+    _string_types = basestring
+except NameError:
+    # python 3
+    _string_types = str
+
+
+def _encode_date(value):
+    return '"' + value.isoformat() + '"'
+
+
+def _encode_float(value):
+    if math.isinf(value) or math.isnan(value):
+        raise ValueError(
+            'Out of range float values are not JSON compliant: {!r}'.format(
+                value
+            )
+        )
+    return float.__repr__(value)
+
+
+def _encode_decimal(value):
+    if not value.is_finite():
+        raise ValueError(
+            'Out of range decimal values are not JSON compliant: {!r}'.format(
+                value
+            )
+        )
+    return str(value)
+
+
+def _encode_key(key):
+    if not isinstance(key, _string_types):
+        # number, bool and None keys are converted as by json.dumps
+        key = json.dumps(key)
+    return encode_basestring_ascii(key)
+
+
+def _encode_fallback(value):
+    """
+    Encode value of type without encoder in ENCODERS:
+    subclasses of known types and nested dicts and lists,
+    which items are encoded with encode_value,
+    so nested Decimal or datetime is encoded as top-level one.
+    """
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (datetime.date, datetime.time)):
+        return _encode_date(value)
+    if isinstance(value, decimal.Decimal):
+        return _encode_decimal(value)
+    if isinstance(value, dict):
+        return '{' + ','.join(
+            _encode_key(key) + ':' + encode_value(item)
+            for key, item in value.items()
+        ) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(encode_value(item) for item in value) + ']'
+    return json.dumps(value, allow_nan=False)
+
+ENCODERS = {
+    type(None): lambda value: 'null',
+    bool: lambda value: 'true' if value else 'false',
+    int: str,
+    float: _encode_float,
+    str: encode_basestring_ascii,
+    datetime.datetime: _encode_date,
+    datetime.date: _encode_date,
+    datetime.time: _encode_date,
+    decimal.Decimal: _encode_decimal,
+}
+try:
+    ENCODERS[long] = str
+    ENCODERS[unicode] = encode_basestring_ascii
+except NameError:
+    # python 3
+    pass
+
+
+def encode_value(value):
+    """
+    Encode single value to JSON.
+    Known types are encoded without json.dumps call.
+    Non-finite numbers(inf, nan) raise ValueError,
+    as json.dumps with allow_nan=False.
+
+    :param object value:
+
+    :rtype: str
+    :return: JSON representation of value
+    """
+    encoder = ENCODERS.get(value.__class__)
+    if encoder is None:
+        return _encode_fallback(value)
+    return encoder(value)
+
+
+def encode_dict(data):
+    """
+    Encode flat dict to JSON object with encode_value.
+
+    :param dict data:
+
+    :rtype: str
+    :return: JSON object
+    """
+    return '{' + ','.join(
+        encode_basestring_ascii(key) + ':' + encode_value(value)
+        for key, value in data.items()
+    ) + '}'
+
+
+def build_row_encoder(keys, funcs):
+    """
+    Build function, that encodes query raw to JSON object.
+    Escaped key fragments are computed once.
+
+    :param tuple keys: field keys
+    :param tuple funcs: serialize function or None for each key
+
+    :rtype: function
+    :return: encode(raw)
+    """
+    if not keys:
+        return lambda raw: '{}'
+
+    prefixes = tuple(
+        (',' if i else '{') + encode_basestring_ascii(key) + ':'
+        for i, key in enumerate(keys)
+    )
+    plan = tuple(zip(prefixes, funcs))
+    encoders_get = ENCODERS.get
+
+    def encode(raw):
+        parts = []
+        append = parts.append
+        for (prefix, func), value in zip(plan, raw):
+            if func is not None:
+                value = func(value)
+            append(prefix)
+            encoder = encoders_get(value.__class__)
+            if encoder is None:
+                append(_encode_fallback(value))
+            else:
+                append(encoder(value))
+        append('}')
+        return ''.join(parts)
+
+    return encode
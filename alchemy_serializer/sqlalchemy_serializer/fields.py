@@ -1,3 +1,6 @@
+import copy
+
+
 class SerializeField(object):
     """
     Basic field for serialization.
@@ -27,14 +30,86 @@ class SerializeField(object):
         """
         return self.func(value)
 
+    def get_serialize_func(self):
+        """
+        Return function, that should be evaluated on result value.
+
+        :rtype: function|None
+        :return: None if value is not changed by field
+        """
+        if self.__class__.serialize != SerializeField.serialize:
+            return self.serialize
+        if self.func == self._zero_serialize:
+            return None
+        return self.func
+
+    def deserialize(self, value):
+        """
+        Convert incoming value back to column value.
+        Override to define inverse of serialize.
+
+        :param object value:
+
+        :rtype: object
+        """
+        return value
+
+    def get_deserialize_func(self):
+        """
+        Return function, that should be evaluated on incoming value.
+
+        :rtype: function|None
+        :return: None if value is not changed by field
+        """
+        if self.__class__.deserialize != SerializeField.deserialize:
+            return self.deserialize
+        return None
+
+    def copy(self, func=None):
+        """
+        Return copy of field, bound to func.
+        Serializers use copies, so field declared in class
+        is never changed by serializer instance.
+
+        :param function func:
+            - if None: func of field is kept
+
+        :rtype: SerializeField
+        """
+        field = copy.copy(self)
+        if func is not None:
+            field.func = func
+        elif self.func == self._zero_serialize:
+            field.func = field._zero_serialize
+        return field
+
 
 class SerializeCustomModelField(object):
+    """
+    Field, that is evaluated on serialized result.
+
+    :param function func:
+        will be evaluated on result dict
+        - if str: name of serializer method
+    :param str key: result key
+    :param expression:
+        SQL expression, that computes the same value.
+        If set: value is selected by query and func is used
+        only for model instances.
+    :param tuple depends:
+        keys of result, that are used by func
+        - if None: func may use any key
+    """
     def __init__(
         self, func,
-        key
+        key,
+        expression=None,
+        depends=None
     ):
         self.func = func
         self.key = key
+        self.expression = expression
+        self.depends = depends
 
     def serialize(self, instance, *args, **kwargs):
         """
@@ -46,3 +121,43 @@ class SerializeCustomModelField(object):
         :return: serialized value
         """
         return self.func(instance, *args, **kwargs)
+
+    def copy(self, func=None):
+        """
+        Return copy of field, bound to func.
+
+        :param function func:
+            - if None: func of field is kept
+
+        :rtype: SerializeCustomModelField
+        """
+        field = copy.copy(self)
+        if func is not None:
+            field.func = func
+        return field
+
+
+class SerializeNestedField(object):
+    """
+    Field for serialization of model relationship
+    with child model serializer.
+
+    :param serializer: child SQLAlchemyModelSerializator class or instance
+    :param str key: relationship key
+    :param bool many:
+        - if None: is taken from relationship uselist
+    :param str load:
+        loader option for relationship:
+        selectinload, joinedload, subqueryload or contains_eager
+        (relationship is outer joined by build_query)
+    """
+    def __init__(
+        self, serializer,
+        key,
+        many=None,
+        load='selectinload'
+    ):
+        self.serializer = serializer
+        self.key = key
+        self.many = many
+        self.load = load
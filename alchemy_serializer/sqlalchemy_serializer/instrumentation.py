@@ -0,0 +1,115 @@
+# coding: utf-8
+import threading
+from timeit import default_timer
+
+
+class SerializeStats(object):
+    """
+    Serialization stats of serializer.
+
+    Collects calls count and cumulative time of field functions,
+    count of serialized raws and total serialization time.
+
+    :param function on_field:
+        will be called with (key, seconds) after each field function call
+    :param function on_raws:
+        will be called with (raws count, seconds) after each serialization
+    """
+    def __init__(self, on_field=None, on_raws=None):
+        self.on_field = on_field
+        self.on_raws = on_raws
+        self.fields = {}
+        self.raws = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_field(self, key, seconds):
+        with self._lock:
+            field_stats = self.fields.get(key)
+            if field_stats is None:
+                field_stats = self.fields[key] = [0, 0.0]
+            field_stats[0] += 1
+            field_stats[1] += seconds
+        if self.on_field is not None:
+            self.on_field(key, seconds)
+
+    def record_raws(self, count, seconds):
+        with self._lock:
+            self.raws += count
+            self.seconds += seconds
+        if self.on_raws is not None:
+            self.on_raws(count, seconds)
+
+    def wrap_field(self, key, func):
+        """
+        Return func, that records its time.
+
+        :param str key: field key
+        :param function func: field function
+
+        :rtype: function
+        """
+        record_field = self.record_field
+
+        def timed(*args, **kwargs):
+            start = default_timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_field(key, default_timer() - start)
+
+        return timed
+
+    def wrap_converter(self, convert, many=False):
+        """
+        Return converter, that records raws count and time.
+
+        :param function convert: converter of raw or list of raws
+        :param bool many: if True: converter takes list of raws
+
+        :rtype: function
+        """
+        record_raws = self.record_raws
+
+        def timed(raws, *args, **kwargs):
+            start = default_timer()
+            try:
+                return convert(raws, *args, **kwargs)
+            finally:
+                record_raws(
+                    len(raws) if many else 1, default_timer() - start
+                )
+
+        return timed
+
+    def as_dict(self):
+        """
+        Return stats as dict.
+
+        .. code:: python
+
+            {
+                'raws': 1000,
+                'seconds': 0.0051,
+                'fields': {
+                    'created_on': {'calls': 1000, 'seconds': 0.0012}
+                }
+            }
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'raws': self.raws,
+                'seconds': self.seconds,
+                'fields': dict(
+                    (key, {'calls': calls, 'seconds': seconds})
+                    for key, (calls, seconds) in self.fields.items()
+                ),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.fields = {}
+            self.raws = 0
+            self.seconds = 0.0
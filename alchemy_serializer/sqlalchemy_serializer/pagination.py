@@ -0,0 +1,92 @@
+# coding: utf-8
+import base64
+import binascii
+import decimal
+import json
+
+from sqlalchemy import and_, or_
+
+from .converters import get_type_converter, get_type_deserializer
+
+
+def _get_types(columns):
+    return [getattr(column, 'type', None) for column in columns]
+
+
+def encode_cursor(values, columns=None):
+    """
+    Encode order values of the last raw to opaque cursor.
+    Values are converted by types of columns,
+    see converters.get_type_converter.
+
+    :param tuple values: order values
+    :param tuple columns:
+        order columns
+        - if None: values should be JSON compatible
+
+    :rtype: str
+    """
+    values = list(values)
+    if columns is not None:
+        for i, column_type in enumerate(_get_types(columns)):
+            convert = get_type_converter(column_type)
+            if convert is not None:
+                values[i] = convert(values[i])
+    data = json.dumps(values, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, size, columns=None):
+    """
+    Decode cursor to order values.
+
+    :param str cursor:
+    :param int size: count of order columns
+    :param tuple columns:
+        order columns, values are converted back by their types
+
+    :rtype: list
+    :raises ValueError: if cursor is invalid
+    """
+    try:
+        values = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        )
+    except (TypeError, ValueError, UnicodeError, binascii.Error):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor')
+    if columns is not None:
+        for i, column_type in enumerate(_get_types(columns)):
+            deserialize = get_type_deserializer(column_type)
+            if deserialize is None:
+                continue
+            try:
+                values[i] = deserialize(values[i])
+            except (TypeError, ValueError, decimal.InvalidOperation):
+                raise ValueError('Invalid cursor')
+    return values
+
+
+def keyset_filter(columns, values):
+    """
+    Return condition, that selects raws after values
+    in ascending order of columns.
+
+    (a, b) > (1, 2) is expanded to a > 1 OR (a = 1 AND b > 2),
+    so it is supported by all databases and uses index on columns.
+
+    :param tuple columns: order columns
+    :param list values: order values of the last raw
+
+    :rtype: sqlalchemy.sql.ClauseElement
+    """
+    conditions = []
+    for i, column in enumerate(columns):
+        conditions.append(and_(*(
+            [columns[j] == values[j] for j in range(i)] +
+            [column > values[i]]
+        )))
+    if len(conditions) == 1:
+        return conditions[0]
+    return or_(*conditions)
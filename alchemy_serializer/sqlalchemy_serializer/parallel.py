@@ -0,0 +1,89 @@
+# coding: utf-8
+import multiprocessing
+import os
+from itertools import count, islice
+
+# Serializers, used by running process pools.
+# Workers are forked, so they inherit serializers without pickling.
+_serializers = {}
+_serializer_ids = count()
+
+
+def _get_fork_context():
+    """
+    Return multiprocessing context, that forks workers.
+
+    :rtype: module|multiprocessing.context.BaseContext|None
+    :return: None if fork is not supported
+    """
+    if not hasattr(os, 'fork'):
+        return None
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is None:
+        # python 2 always forks on posix
+        return multiprocessing
+    return get_context('fork')
+
+
+def _serialize_chunk(task):
+    serializer_id, raws, custom_args, custom_kwargs = task
+    serializer = _serializers[serializer_id]
+    return serializer._get_rows_converter()(raws, custom_args, custom_kwargs)
+
+
+def _iter_chunks(raws, chunk_size):
+    raws = iter(raws)
+    while True:
+        chunk = [tuple(raw) for raw in islice(raws, chunk_size)]
+        if not chunk:
+            break
+        yield chunk
+
+
+def serialize_parallel(
+    serializer, raws, processes=None, chunk_size=10000,
+    custom_args=(), custom_kwargs=None
+):
+    """
+    Serialize raws in process pool.
+
+    Raws are converted to plain tuples and partitioned by chunk_size,
+    results are returned in order of raws.
+
+    :param SQLAlchemySerializator serializer:
+    :param list raws: tuples to serialize
+    :param int processes:
+        pool size
+        - if None: count of cpus
+    :param int chunk_size: count of raws sent to worker at a time
+    :param tuple custom_args:
+    :param dict custom_kwargs:
+
+    :rtype: list
+    :return: list of dicts
+    """
+    context = _get_fork_context()
+    if context is None:
+        return serializer._get_rows_converter()(
+            raws, custom_args, custom_kwargs
+        )
+
+    serializer._get_rows_converter()
+    serializer_id = next(_serializer_ids)
+    _serializers[serializer_id] = serializer
+    try:
+        pool = context.Pool(processes)
+        try:
+            tasks = (
+                (serializer_id, chunk, custom_args, custom_kwargs)
+                for chunk in _iter_chunks(raws, chunk_size)
+            )
+            results = []
+            for chunk in pool.imap(_serialize_chunk, tasks):
+                results.extend(chunk)
+        finally:
+            pool.close()
+            pool.join()
+    finally:
+        del _serializers[serializer_id]
+    return results
@@ -0,0 +1,155 @@
+# coding: utf-8
+
+_missing = object()
+
+
+class SerializerRegistry(object):
+    """
+    Registry of model serializers.
+
+    Serializer of instance is found by class of instance:
+    registered serializer of the nearest class in MRO is used,
+    so serializer of base model serves not registered subclasses.
+    Resolved classes are cached, so after the first instance
+    of class resolving costs one dict lookup.
+
+    .. code:: python
+
+        registry = SerializerRegistry()
+        registry.register(GuildSerializator())
+        registry.register(GuildMemberSerializator())
+
+        data = registry.to_dicts(
+            session.query(Guild, GuildMember).join(GuildMember.guild)
+        )
+        # [({guild data}, {member data}), ...]
+    """
+    def __init__(self):
+        self._serializers = {}
+        self._resolved = {}
+
+    def register(self, serializer, model=None):
+        """
+        Register serializer of model.
+
+        :param serializer: SQLAlchemyModelSerializator instance or class
+        :param model:
+            - if None: model of serializer
+
+        :return: serializer, so class can be registered with decorator
+        """
+        instance = serializer
+        if isinstance(serializer, type):
+            instance = serializer()
+        if model is None:
+            model = instance.model
+        self._serializers[model] = instance
+        self._resolved = {}
+        return serializer
+
+    def unregister(self, model):
+        self._serializers.pop(model, None)
+        self._resolved = {}
+
+    def find(self, cls):
+        """
+        Return serializer of class.
+
+        :param type cls: model class
+
+        :rtype: SQLAlchemyModelSerializator|None
+        :return: None if there is no serializer for class
+        """
+        serializer = self._resolved.get(cls, _missing)
+        if serializer is not _missing:
+            return serializer
+
+        serializers = self._serializers
+        serializer = None
+        for base in cls.__mro__:
+            serializer = serializers.get(base)
+            if serializer is not None:
+                break
+        self._resolved[cls] = serializer
+        return serializer
+
+    def get(self, cls):
+        """
+        Return serializer of class.
+
+        :param type cls: model class
+
+        :rtype: SQLAlchemyModelSerializator
+        :raises ValueError: if there is no serializer for class
+        """
+        serializer = self.find(cls)
+        if serializer is None:
+            raise ValueError(
+                'No serializer registered for {}'.format(cls.__name__)
+            )
+        return serializer
+
+    def to_dict(self, instance, *custom_args, **custom_kwargs):
+        """
+        Serialize instance with serializer of its class.
+
+        :param instance: model instance
+
+        :rtype: dict
+        """
+        return self.get(instance.__class__).to_dict(
+            instance, *custom_args, **custom_kwargs
+        )
+
+    def to_dicts(self, raws, *custom_args, **custom_kwargs):
+        """
+        Serialize instances of different models.
+
+        Instances are grouped by serializer,
+        each serializer serializes its group with one to_dicts call.
+
+        :param raws:
+            query or iterable of model instances
+            or of rows of model instances
+            (session.query(Guild, GuildMember))
+
+        :rtype: list
+        :return: list of dicts or list of tuples of dicts for rows,
+            None is kept as None
+        """
+        raws = list(raws)
+        first = next((raw for raw in raws if raw is not None), None)
+        if first is None or hasattr(first, '_sa_instance_state'):
+            return self._to_dicts(raws, custom_args, custom_kwargs)
+
+        width = len(first)
+        instances = [instance for raw in raws for instance in raw]
+        dicts = self._to_dicts(instances, custom_args, custom_kwargs)
+        return [
+            tuple(dicts[i:i + width]) for i in range(0, len(dicts), width)
+        ]
+
+    def _to_dicts(self, instances, custom_args, custom_kwargs):
+        resolved_get = self._resolved.get
+        groups = {}
+        for i, instance in enumerate(instances):
+            if instance is None:
+                continue
+            cls = instance.__class__
+            serializer = resolved_get(cls)
+            if serializer is None:
+                serializer = self.get(cls)
+            group = groups.get(serializer)
+            if group is None:
+                group = groups[serializer] = ([], [])
+            group[0].append(i)
+            group[1].append(instance)
+
+        results = [None] * len(instances)
+        for serializer, (indexes, group) in groups.items():
+            serialized = serializer.to_dicts(
+                group, *custom_args, **custom_kwargs
+            )
+            for i, data in zip(indexes, serialized):
+                results[i] = data
+        return results
@@ -1,11 +1,302 @@
 # coding: utf-8
-from sqlalchemy_utils.functions import (
-    get_columns, get_hybrid_properties
+import copy
+import io
+from array import array
+from itertools import islice
+from operator import attrgetter
+
+from sqlalchemy import inspect
+from sqlalchemy import orm
+from sqlalchemy.ext.hybrid import HYBRID_PROPERTY
+from sqlalchemy.orm import Session
+from .cache import LRUCache
+from .converters import get_type_converter, get_type_deserializer
+from .encoders import build_row_encoder, encode_dict
+from .fields import (
+    SerializeField, SerializeCustomModelField, SerializeNestedField
 )
-from .fields import SerializeField, SerializeCustomModelField
+from .instrumentation import SerializeStats
+from .pagination import decode_cursor, encode_cursor, keyset_filter
 
+try:
+    string_types = basestring
+except NameError:
+    # python 3
+    string_types = str
 
-class SQLAlchemySerializator(object):
+
+def _get_convert_plan(serialize_fields, custom_serialize_fields):
+    """
+    Split fields into keys, serialize functions and custom functions.
+
+    :param list serialize_fields:
+    :param list custom_serialize_fields:
+
+    :rtype: tuple
+    :return: keys, (index, key, func) tuples, (key, func) tuples
+    """
+    keys = tuple(field.key for field in serialize_fields)
+    funcs = []
+    for i, field in enumerate(serialize_fields):
+        func = field.get_serialize_func()
+        if func is not None:
+            funcs.append((i, field.key, func))
+    custom_funcs = tuple(
+        (field.key, field.serialize) for field in custom_serialize_fields
+    )
+    return keys, tuple(funcs), custom_funcs
+
+
+def _build_row_converter(keys, funcs, custom_funcs, hidden=()):
+    """
+    Build function, that converts query raw to dict.
+
+    Pass-through fields are copied as is,
+    only fields with serialize function are evaluated.
+
+    :param tuple keys: field keys
+    :param tuple funcs: (index, key, func) tuples
+    :param tuple custom_funcs: (key, func) tuples
+    :param tuple hidden: keys, dropped after custom functions
+
+    :rtype: function
+    :return: convert(raw, custom_args, custom_kwargs)
+    """
+    def convert(raw, custom_args=(), custom_kwargs=None):
+        result = dict(zip(keys, raw))
+        for i, key, func in funcs:
+            result[key] = func(raw[i])
+        if custom_funcs:
+            custom_kwargs = custom_kwargs or {}
+            for key, func in custom_funcs:
+                result[key] = func(result, *custom_args, **custom_kwargs)
+        for key in hidden:
+            result.pop(key, None)
+        return result
+
+    return convert
+
+
+def _build_rows_converter(keys, funcs, custom_funcs, hidden=()):
+    """
+    Build function, that converts list of query raws to list of dicts.
+
+    Serialize functions are applied column-wise:
+    each function is mapped over the whole column in one pass.
+
+    :param tuple keys: field keys
+    :param tuple funcs: (index, key, func) tuples
+    :param tuple custom_funcs: (key, func) tuples
+    :param tuple hidden: keys, dropped after custom functions
+
+    :rtype: function
+    :return: convert_many(raws, custom_args, custom_kwargs)
+    """
+    def convert_many(raws, custom_args=(), custom_kwargs=None):
+        if not keys:
+            results = [{} for _ in raws]
+        else:
+            columns = list(zip(*raws))[:len(keys)]
+            for i, key, func in funcs:
+                columns[i] = [func(value) for value in columns[i]]
+            results = [dict(zip(keys, values)) for values in zip(*columns)]
+        if custom_funcs:
+            custom_kwargs = custom_kwargs or {}
+            for result in results:
+                for key, func in custom_funcs:
+                    result[key] = func(
+                        result, *custom_args, **custom_kwargs
+                    )
+        if hidden:
+            for result in results:
+                for key in hidden:
+                    result.pop(key, None)
+        return results
+
+    return convert_many
+
+
+def _build_columns_converter(keys, funcs):
+    """
+    Build function, that converts list of query raws to list of columns.
+
+    :param tuple keys: field keys
+    :param tuple funcs: (index, key, func) tuples
+
+    :rtype: function
+    :return: convert_columns(raws)
+    """
+    length = len(keys)
+
+    def convert_columns(raws):
+        if not raws:
+            return [[] for _ in keys]
+        columns = [list(column) for column in list(zip(*raws))[:length]]
+        for i, key, func in funcs:
+            columns[i] = [func(value) for value in columns[i]]
+        return columns
+
+    return convert_columns
+
+
+try:
+    _INTEGER_TYPES = frozenset([int, long])
+except NameError:
+    # python 3
+    _INTEGER_TYPES = frozenset([int])
+
+
+def _to_array(values):
+    """
+    Pack column of integers or floats to array.
+
+    :param list values:
+
+    :rtype: array.array|list
+    :return: values if they are not all integers or all floats
+    """
+    types = set(value.__class__ for value in values)
+    if not types:
+        return values
+    if types <= _INTEGER_TYPES:
+        try:
+            return array('l', values)
+        except OverflowError:
+            return values
+    if types == set([float]):
+        return array('d', values)
+    return values
+
+
+def _build_attr_getter(keys):
+    """
+    Build function, that returns tuple of instance attributes.
+
+    :param tuple keys:
+
+    :rtype: function
+    """
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda instance: (getattr(instance, key),)
+    if not keys:
+        return lambda instance: ()
+    return attrgetter(*keys)
+
+
+def _build_row_deserializer(plan, read_only):
+    """
+    Build function, that converts incoming dict to column values.
+
+    :param dict plan: key: (target key, func or None)
+    :param frozenset read_only: keys, that are skipped
+
+    :rtype: function
+    """
+    def deserialize(data):
+        values = {}
+        for key, value in data.items():
+            entry = plan.get(key)
+            if entry is None:
+                if key in read_only:
+                    continue
+                raise ValueError('Unknown field {}'.format(key))
+            target, func = entry
+            values[target] = value if func is None else func(value)
+        return values
+
+    return deserialize
+
+
+def _is_instance(raw):
+    """
+    Check shape of query result: model instance or row.
+    Rows are tuples in SQLAlchemy < 1.4 and Row objects since.
+
+    :rtype: bool
+    """
+    return hasattr(raw, '_sa_instance_state')
+
+
+def _get_stream_load(load, many, joined):
+    """
+    Return loader of relationship, that is compatible with yield_per.
+
+    :param str load: loader of nested field
+    :param bool many: if True: relationship is collection
+    :param bool joined: if True: parent is loaded by the streamed query
+
+    :rtype: str
+    """
+    if not joined:
+        # relationship is loaded by query of parent loader,
+        # so it can't be joined to the streamed query
+        return 'joinedload' if load == 'contains_eager' else load
+    if load == 'subqueryload' or many and load != 'selectinload':
+        return 'selectinload'
+    return load
+
+
+# Inspected fields of models, see _inspect_model.
+_model_inspections = {}
+
+
+def _inspect_model(model):
+    """
+    Return columns and labeled hybrid fields of model.
+    Model is inspected with its mapper on first call,
+    result is cached per model.
+
+    :param model: mapped class
+
+    :rtype: tuple
+    :return: (columns tuple, hybrid fields tuple)
+    """
+    inspection = _model_inspections.get(model)
+    if inspection is not None:
+        return inspection
+
+    mapper = inspect(model)
+    columns = tuple(mapper.columns)
+    hybrid_fields = []
+    for key, descriptor in mapper.all_orm_descriptors.items():
+        if descriptor.extension_type is not HYBRID_PROPERTY:
+            continue
+        field = getattr(model, key)
+
+        field.key = key
+        hybrid_fields.append(field)
+
+    inspection = _model_inspections[model] = (columns, tuple(hybrid_fields))
+    return inspection
+
+
+class SerializatorMeta(type):
+    """
+    Serializer metaclass.
+
+    Collects custom fields, declared in class body,
+    and creates class caches of field plans, so inspection
+    of class attributes and models is done once per class.
+    """
+    def __init__(cls, name, bases, attrs):
+        super(SerializatorMeta, cls).__init__(name, bases, attrs)
+        cls._declared_custom_fields = [
+            value for value in attrs.values()
+            if isinstance(value, SerializeCustomModelField)
+        ]
+        cls._declared_nested_fields = [
+            value for value in attrs.values()
+            if isinstance(value, SerializeNestedField)
+        ]
+        cls._serialize_specs = {}
+        cls._field_plans = {}
+
+
+_SerializatorBase = SerializatorMeta('_SerializatorBase', (object,), {})
+
+
+class SQLAlchemySerializator(_SerializatorBase):
     """
     Base serialize class.
     Class is intended to work only with group of fields.
@@ -26,6 +317,9 @@ class SQLAlchemySerializator(object):
     To serialize field with custom function:
         define serialize_label(self, value) function.
 
+    To skip fields(both in query and result):
+        set exclude or only with field keys.
+
     Example usecase:
 
     .. code:: python
@@ -60,9 +354,13 @@ class SQLAlchemySerializator(object):
         data = map(serializator.to_dict, users)
     """
     fields = None
+    exclude = None
+    only = None
+    fields_cache_size = 128
 
     def __init__(
-        self, *extra_fields
+        self, *extra_fields,
+        **kwargs
     ):
         """
         Build serializer, based on class fields and extra_fields.
@@ -76,16 +374,39 @@ class SQLAlchemySerializator(object):
 
         :param tuple extra_fields:
             extra fields to extend class serializer fields
+
+        :param kwargs:
+            class args: exclude, only
         """
         self.query_fields = []
         self.serialize_fields = []
         self.custom_serialize_fields = []
+        self.sql_custom_serialize_fields = []
+        self.stats = None
+        self._derived = None
+        self._hidden_keys = ()
+
+        exclude = kwargs.get('exclude', None)
+        if exclude is None:
+            exclude = self.__class__.exclude
+        self.exclude = frozenset(exclude or [])
+
+        only = kwargs.get('only', None)
+        if only is None:
+            only = self.__class__.only
+        self.only = frozenset(only) if only is not None else None
 
         self._init_query_fields(
             extra_fields=extra_fields,
         )
-        self._init_serialize_fields()
+        self.query_fields = [
+            field for field in self.query_fields
+            if self._is_serialized(field.key)
+        ]
         self._init_custom_serialize_fields()
+        self.query_fields.extend(self._get_custom_expressions())
+        self._init_serialize_fields()
+        self._init_converters()
 
     def _init_query_fields(
         self, extra_fields=None,
@@ -96,16 +417,54 @@ class SQLAlchemySerializator(object):
 
         self.query_fields = query_fields
 
+    def _is_serialized(self, key):
+        """
+        Check that field is not excluded by exclude or only.
+
+        :param str key: field key
+
+        :rtype: bool
+        """
+        if key in self.exclude:
+            return False
+        return self.only is None or key in self.only
+
+    @classmethod
+    def _get_serialize_spec(cls, key):
+        """
+        Return class attributes, that define serialization of field.
+
+        :param str key: field key
+
+        :rtype: tuple
+        :return: (SerializeField or None, serialize function name or None)
+        """
+        serialize_field = getattr(cls, key, None)
+        if not isinstance(serialize_field, SerializeField):
+            serialize_field = None
+        func_name = "serialize_{}".format(key)
+        if getattr(cls, func_name, None) is None:
+            func_name = None
+        return serialize_field, func_name
+
     def _init_serialize_fields(self):
+        specs = self.__class__._serialize_specs
         serialize_fields = []
         for field in self.query_fields:
             key = field.key
-            if not key:
-                raise ValueError('provide label for all non-Model fields')
-            serialize_field = getattr(self, key, None)
-            serialize_func = getattr(
-                self, "serialize_{}".format(key), None
-            )
+            spec = specs.get(key)
+            if spec is None:
+                if not key:
+                    raise ValueError('provide label for all non-Model fields')
+                spec = specs[key] = self._get_serialize_spec(key)
+
+            serialize_field, func_name = spec
+            serialize_func = getattr(self, func_name) if func_name else None
+            if serialize_func is None and (
+                serialize_field is None or
+                serialize_field.get_serialize_func() is None
+            ):
+                serialize_func = self._get_default_serialize_func(field)
 
             if serialize_field is None:
                 serialize_field = SerializeField(
@@ -113,23 +472,293 @@ class SQLAlchemySerializator(object):
                     func=serialize_func
                 )
             else:
-                if serialize_func is not None:
-                    serialize_field.func = serialize_func
+                serialize_field = serialize_field.copy(func=serialize_func)
 
             serialize_fields.append(serialize_field)
 
         self.serialize_fields = serialize_fields
 
+    def with_fields(self, *keys):
+        """
+        Return serializer, narrowed to keys.
+        Derived serializer selects and serializes only its fields.
+        Derived serializers are cached by set of keys,
+        so repeated field sets cost only a lookup.
+
+        Fields, that custom fields depend on, are selected
+        and passed to custom functions, but are not in result
+        (custom field without depends selects all fields).
+
+        .. code:: python
+
+            serializer = UserSerializator()
+
+            fields = request.args['fields'].split(',')
+            narrow = serializer.with_fields(*fields)
+            data = narrow.to_dicts(narrow.build_query(session))
+
+        :param tuple keys: result keys
+
+        :rtype: SQLAlchemySerializator
+        """
+        keys = frozenset(keys)
+        derived = self._derived
+        if derived is None:
+            derived = self._derived = LRUCache(
+                maxsize=self.__class__.fields_cache_size
+            )
+        serializer = derived.get(keys)
+        if serializer is None:
+            serializer = self._derive(keys)
+            derived.set(keys, serializer)
+        return serializer
+
+    def _derive(self, keys):
+        """
+        Build copy of serializer, narrowed to keys.
+
+        :param frozenset keys: result keys
+
+        :rtype: SQLAlchemySerializator
+        """
+        result_keys = self.get_result_keys()
+        unknown = keys.difference(result_keys)
+        if unknown:
+            raise ValueError(
+                'Unknown fields {}'.format(', '.join(sorted(unknown)))
+            )
+
+        requested = keys
+        keys = set(keys)
+        for field in (
+            self.custom_serialize_fields + self.sql_custom_serialize_fields
+        ):
+            if field.key not in keys:
+                continue
+            if field.depends is None:
+                keys.update(self._get_serialized_keys())
+                break
+            keys.update(field.depends)
+
+        serializer = copy.copy(self)
+        # derived serializers of parent are not narrowed to keys
+        serializer._derived = None
+        serializer._hidden_keys = tuple(sorted(keys.difference(requested)))
+        if self.only is None:
+            serializer.only = frozenset(keys)
+        else:
+            serializer.only = self.only.intersection(keys)
+        serializer._narrow()
+        return serializer
+
+    def _narrow(self):
+        """
+        Drop fields, that are not serialized, and rebuild converters.
+        """
+        is_serialized = self._is_serialized
+        self.query_fields = [
+            field for field in self.query_fields if is_serialized(field.key)
+        ]
+        self.serialize_fields = [
+            field for field in self.serialize_fields
+            if is_serialized(field.key)
+        ]
+        self.custom_serialize_fields = [
+            field for field in self.custom_serialize_fields
+            if is_serialized(field.key)
+        ]
+        self.sql_custom_serialize_fields = [
+            field for field in self.sql_custom_serialize_fields
+            if is_serialized(field.key)
+        ]
+        self._init_converters()
+
+    def _get_default_serialize_func(self, field):
+        """
+        Return serialize function of field without declared one.
+
+        :param field: query field
+
+        :rtype: function|None
+        """
+        return None
+
     def _init_custom_serialize_fields(self):
-        self.custom_serialize_fields = filter(
-            lambda x: isinstance(x, SerializeCustomModelField),
-            self.__class__.__dict__.values()
-        )
-        for field in self.custom_serialize_fields:
-            if isinstance(field.func, basestring):
-                field.func = getattr(self, field.func, None)
-                if field.func is None:
+        custom_serialize_fields = []
+        sql_custom_serialize_fields = []
+        for field in self.__class__._declared_custom_fields:
+            if not self._is_serialized(field.key):
+                continue
+            func = None
+            if isinstance(field.func, string_types):
+                func = getattr(self, field.func, None)
+                if func is None:
                     raise ValueError('Provide correct func for custom field')
+            if field.expression is None:
+                custom_serialize_fields.append(field.copy(func=func))
+            else:
+                sql_custom_serialize_fields.append(field.copy(func=func))
+
+        self.custom_serialize_fields = custom_serialize_fields
+        self.sql_custom_serialize_fields = sql_custom_serialize_fields
+
+    def _get_custom_expressions(self):
+        """
+        Return labeled expressions of custom fields, computed by query.
+        Labels are cached in class field plans.
+
+        :rtype: list
+        """
+        plans = self.__class__._field_plans
+        expressions = []
+        for field in self.sql_custom_serialize_fields:
+            plan_key = ('expression', field.key)
+            expression = plans.get(plan_key)
+            if expression is None:
+                expression = plans[plan_key] = field.expression.label(
+                    field.key
+                )
+            expressions.append(expression)
+        return expressions
+
+    def _init_converters(self):
+        """
+        Build row converters once per serializer,
+        so to_dict does not dispatch through fields on every raw.
+        """
+        keys, funcs, custom_funcs = _get_convert_plan(
+            self.serialize_fields, self.custom_serialize_fields
+        )
+        stats = self.stats
+        if stats is not None:
+            funcs = tuple(
+                (i, key, stats.wrap_field(key, func))
+                for i, key, func in funcs
+            )
+            custom_funcs = tuple(
+                (key, stats.wrap_field(key, func))
+                for key, func in custom_funcs
+            )
+        self._convert_plan = keys, funcs, custom_funcs
+
+        self._convert = _build_row_converter(
+            *self._convert_plan, hidden=self._hidden_keys
+        )
+        if stats is not None:
+            self._convert = stats.wrap_converter(self._convert)
+        self._get_attrs = _build_attr_getter(keys)
+        self._convert_many = None
+        self._convert_columns = None
+        self._encode_json = None
+
+    def _get_rows_converter(self):
+        """
+        Return converter of raws lists, build it on first call.
+
+        :rtype: function
+        """
+        if self._convert_many is None:
+            convert_many = _build_rows_converter(
+                *self._convert_plan, hidden=self._hidden_keys
+            )
+            if self.stats is not None:
+                convert_many = self.stats.wrap_converter(
+                    convert_many, many=True
+                )
+            self._convert_many = convert_many
+        return self._convert_many
+
+    def _get_columns_converter(self):
+        """
+        Return converter of raws lists to columns, build it on first call.
+
+        :rtype: function
+        """
+        if self._convert_columns is None:
+            keys, funcs, _ = self._convert_plan
+            convert_columns = _build_columns_converter(keys, funcs)
+            if self.stats is not None:
+                convert_columns = self.stats.wrap_converter(
+                    convert_columns, many=True
+                )
+            self._convert_columns = convert_columns
+        return self._convert_columns
+
+    def _get_json_encoder(self):
+        """
+        Return JSON encoder of raws, build it on first call.
+
+        :rtype: function
+        """
+        if self._encode_json is None:
+            keys, funcs, _ = self._convert_plan
+            encode_funcs = [None] * len(keys)
+            for i, key, func in funcs:
+                encode_funcs[i] = func
+            encode = build_row_encoder(keys, tuple(encode_funcs))
+            if self.stats is not None:
+                encode = self.stats.wrap_converter(encode)
+            self._encode_json = encode
+        return self._encode_json
+
+    def enable_stats(self, on_field=None, on_raws=None):
+        """
+        Start collecting serialization stats.
+        Serializer without stats has no instrumentation overhead.
+
+        .. code:: python
+
+            serializator.enable_stats()
+            serializator.to_dicts(query)
+            serializator.get_stats()
+            # {'raws': 100, 'seconds': 0.0004, 'fields': {
+            #     'created_on': {'calls': 100, 'seconds': 0.0001}}}
+
+        :param function on_field:
+            will be called with (key, seconds) after each field function call
+        :param function on_raws:
+            will be called with (raws count, seconds) after each serialization
+
+        :rtype: SerializeStats
+        """
+        self.stats = SerializeStats(on_field=on_field, on_raws=on_raws)
+        self._init_converters()
+        return self.stats
+
+    def disable_stats(self):
+        """
+        Stop collecting serialization stats.
+        """
+        self.stats = None
+        self._init_converters()
+
+    def get_stats(self):
+        """
+        Return collected serialization stats.
+
+        :rtype: dict|None
+        :return: None if stats are disabled
+        """
+        if self.stats is None:
+            return None
+        return self.stats.as_dict()
+
+    def _prepare_query(self, raws):
+        """
+        Return query or raws to be serialized.
+
+        :param raws: query or iterable of query results
+        """
+        return raws
+
+    def _prepare_raws(self, raws):
+        """
+        Return list of tuples to be converted.
+
+        :param raws: query or iterable of query results
+        :rtype: list
+        """
+        return list(raws)
 
     def get_query_fields(self):
         """
@@ -150,6 +779,42 @@ class SQLAlchemySerializator(object):
     def get_fields(self):
         return self.get_query_fields()
 
+    def build_query(self, session, stream=False):
+        """
+        Return query, that selects all serialized fields.
+
+        .. code:: python
+
+            query = serializator.build_query(session).filter(...)
+
+        :param sqlalchemy.orm.Session session:
+        :param bool stream: if True: query will be executed with yield_per
+
+        :rtype: sqlalchemy.orm.Query
+        """
+        return session.query(*self.get_query_fields())
+
+    def _is_tuple_serializable(self):
+        """
+        Check that all fields can be serialized from raw tuples.
+
+        :rtype: bool
+        """
+        return True
+
+    def _is_columnar(self):
+        """
+        Check that result can be built from raw tuples
+        column by column, without building dicts.
+
+        :rtype: bool
+        """
+        return (
+            not self.custom_serialize_fields and
+            not self._hidden_keys and
+            self._is_tuple_serializable()
+        )
+
     def to_dict(self, raw, *custom_args, **custom_kwargs):
         """
         Return dict from sqlalchemy raw result.
@@ -170,14 +835,406 @@ class SQLAlchemySerializator(object):
         :rtype: dict
         :return: dict with keys associated to labels.
         """
-        result = {}
-        for i, field in enumerate(self.serialize_fields):
-            result[field.key] = field.serialize(raw[i])
-        for field in self.custom_serialize_fields:
-            result[field.key] = field.serialize(
-                result, *custom_args, **custom_kwargs
+        return self._convert(raw, custom_args, custom_kwargs)
+
+    def to_dicts(self, raws, *custom_args, **custom_kwargs):
+        """
+        Return list of dicts from sqlalchemy query or list of raws.
+        Serialize functions are applied column-wise,
+        so it is faster than mapping to_dict on big results.
+
+        .. code:: python
+
+            serializator.to_dicts(
+                session.query(*serializator.get_query_fields())
+            )
+
+        :param raws: query or list of query results
+        :type raws: sqlalchemy.orm.Query|list
+
+        :param custom_args:
+            will be dispatched to custom_field functions
+        :type custom_kwargs:
+            will be dispatched to custom_field functions
+
+        :rtype: list
+        :return: list of dicts with keys associated to labels.
+        """
+        raws = self._prepare_raws(self._prepare_query(raws))
+        if not raws:
+            return []
+        return self._get_rows_converter()(raws, custom_args, custom_kwargs)
+
+    def get_result_keys(self):
+        """
+        Return keys of serialized result.
+
+        :rtype: tuple
+        """
+        keys = self._get_serialized_keys()
+        if self._hidden_keys:
+            hidden = self._hidden_keys
+            keys = tuple(key for key in keys if key not in hidden)
+        return keys
+
+    def _get_serialized_keys(self):
+        """
+        Return keys of serialized fields,
+        including hidden dependencies of custom fields.
+
+        :rtype: tuple
+        """
+        return tuple(
+            [field.key for field in self.serialize_fields] +
+            [field.key for field in self.custom_serialize_fields]
+        )
+
+    def to_tuples(self, raws, *custom_args, **custom_kwargs):
+        """
+        Return header and list of value tuples
+        from sqlalchemy query or list of raws.
+        Keys are not repeated in every result.
+
+        .. code:: python
+
+            header, rows = serializator.to_tuples(query)
+            # ('id', 'name'), [(1, 'George'), (2, 'Bob')]
+
+        :param raws: query or list of query results
+        :type raws: sqlalchemy.orm.Query|list
+
+        :param custom_args:
+            will be dispatched to custom_field functions
+        :type custom_kwargs:
+            will be dispatched to custom_field functions
+
+        :rtype: tuple
+        :return: (keys tuple, list of value tuples)
+        """
+        raws = self._prepare_query(raws)
+        header = self.get_result_keys()
+        if self._is_columnar():
+            raws = self._prepare_raws(raws)
+            if not header:
+                return header, [() for _ in raws]
+            return header, list(zip(*self._get_columns_converter()(raws)))
+
+        results = self.to_dicts(raws, *custom_args, **custom_kwargs)
+        return header, [
+            tuple(result[key] for key in header) for result in results
+        ]
+
+    def to_columns(
+        self, raws, arrays=False,
+        custom_args=(), custom_kwargs=None
+    ):
+        """
+        Return dict of columns from sqlalchemy query or list of raws.
+
+        .. code:: python
+
+            serializator.to_columns(query, arrays=True)
+            # {'id': array('l', [1, 2]), 'name': ['George', 'Bob']}
+
+        :param raws: query or list of query results
+        :type raws: sqlalchemy.orm.Query|list
+
+        :param bool arrays:
+            if True: pack columns of integers or floats to array.array
+
+        :param tuple custom_args:
+            will be dispatched to custom_field functions
+        :param dict custom_kwargs:
+            will be dispatched to custom_field functions
+
+        :rtype: dict
+        :return: key -> list of values
+        """
+        raws = self._prepare_query(raws)
+        header = self.get_result_keys()
+        if self._is_columnar():
+            columns = self._get_columns_converter()(self._prepare_raws(raws))
+        else:
+            results = self.to_dicts(
+                raws, *custom_args, **(custom_kwargs or {})
+            )
+            columns = [[result[key] for result in results] for key in header]
+
+        if arrays:
+            columns = map(_to_array, columns)
+        return dict(zip(header, columns))
+
+    def to_dicts_parallel(
+        self, raws, processes=None, chunk_size=10000, min_raws=50000,
+        custom_args=(), custom_kwargs=None
+    ):
+        """
+        Return list of dicts, serialized in process pool.
+        Intended for big CPU-bound results(heavy serialize functions).
+        Raws are sent to workers as plain tuples,
+        small results are serialized in process.
+
+        .. code:: python
+
+            serializator.to_dicts_parallel(
+                session.query(*serializator.get_query_fields()),
+                processes=4
             )
-        return result
+
+        :param raws: query or list of query results
+        :type raws: sqlalchemy.orm.Query|list
+
+        :param int processes:
+            pool size
+            - if None: count of cpus
+        :param int chunk_size: count of raws sent to worker at a time
+        :param int min_raws: min count of raws to use process pool
+
+        :param tuple custom_args:
+            will be dispatched to custom_field functions
+        :param dict custom_kwargs:
+            will be dispatched to custom_field functions
+
+        :rtype: list
+        :return: list of dicts with keys associated to labels.
+        """
+        custom_kwargs = custom_kwargs or {}
+        raws = self._prepare_query(raws)
+        if not self._is_tuple_serializable():
+            return self.to_dicts(raws, *custom_args, **custom_kwargs)
+
+        raws = self._prepare_raws(raws)
+        if len(raws) < max(min_raws, 1) or processes == 1:
+            return self.to_dicts(raws, *custom_args, **custom_kwargs)
+        from .parallel import serialize_parallel
+        return serialize_parallel(
+            self, raws,
+            processes=processes,
+            chunk_size=chunk_size,
+            custom_args=custom_args,
+            custom_kwargs=custom_kwargs
+        )
+
+    def _get_page_order(self):
+        """
+        Return default order columns of pages.
+
+        :rtype: tuple|None
+        """
+        return None
+
+    def paginate(
+        self, query, cursor=None, limit=50, order_by=None,
+        custom_args=(), custom_kwargs=None
+    ):
+        """
+        Serialize page of query results with keyset pagination.
+
+        Page is selected by condition on order columns
+        instead of OFFSET, so every page costs the same.
+        Order columns should be unique together and indexed,
+        their values are put to cursor with built-in type converters,
+        see converters.get_type_converter.
+
+        .. code:: python
+
+            data, cursor = serializator.paginate(session, limit=100)
+            while cursor is not None:
+                data, cursor = serializator.paginate(
+                    session, cursor=cursor, limit=100
+                )
+
+        :param query:
+            query to serialize
+            - if session: query is built with build_query()
+        :type query: sqlalchemy.orm.Query|sqlalchemy.orm.Session
+
+        :param str cursor:
+            cursor of previous page
+            - if None: first page
+        :param int limit: page size
+        :param tuple order_by:
+            ascending order columns
+            - if None: default order(model primary key)
+            ORDER BY of query is replaced with them
+
+        :param tuple custom_args:
+            will be dispatched to custom_field functions
+        :param dict custom_kwargs:
+            will be dispatched to custom_field functions
+
+        :rtype: tuple
+        :return: (list of dicts, cursor of next page or None)
+        """
+        if order_by is None:
+            order_by = self._get_page_order()
+        if not order_by:
+            raise ValueError('Provide order_by for pagination')
+        order_by = tuple(order_by)
+        size = len(order_by)
+
+        if isinstance(query, Session):
+            query = self.build_query(query)
+        query = self._prepare_query(query)
+        descriptions = query.column_descriptions
+        entity = (
+            len(descriptions) == 1 and
+            descriptions[0]['expr'] is descriptions[0]['entity']
+        )
+
+        query = query.add_columns(*order_by)
+        if cursor is not None:
+            query = query.filter(
+                keyset_filter(
+                    order_by, decode_cursor(cursor, size, order_by)
+                )
+            )
+        raws = query.order_by(None).order_by(*order_by).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(raws) > limit:
+            raws = raws[:limit]
+            next_cursor = encode_cursor(raws[-1][-size:], order_by)
+        if entity:
+            raws = [raw[0] for raw in raws]
+        else:
+            raws = [tuple(raw[:-size]) for raw in raws]
+
+        custom_kwargs = custom_kwargs or {}
+        return (
+            self.to_dicts(raws, *custom_args, **custom_kwargs),
+            next_cursor
+        )
+
+    def iter_dicts(
+        self, query, chunk_size=1000, chunked=False,
+        custom_args=(), custom_kwargs=None
+    ):
+        """
+        Lazily serialize query results.
+        Query is executed with yield_per(stream_results),
+        so only one chunk of raws is kept in memory.
+
+        .. code:: python
+
+            for data in serializator.iter_dicts(session):
+                export(data)
+
+            for chunk in serializator.iter_dicts(
+                session.query(User), chunk_size=500, chunked=True
+            ):
+                export_many(chunk)
+
+        :param query:
+            query to serialize
+            - if session: query is built with build_query(stream=True)
+        :type query: sqlalchemy.orm.Query|sqlalchemy.orm.Session
+
+        :param int chunk_size: count of raws fetched at a time
+        :param bool chunked: if True: yield lists of dicts instead of dicts
+
+        :param tuple custom_args:
+            will be dispatched to custom_field functions
+        :param dict custom_kwargs:
+            will be dispatched to custom_field functions
+
+        :rtype: generator
+        """
+        if isinstance(query, Session):
+            query = self.build_query(query, stream=True)
+        query = self._prepare_query(query)
+        raws = iter(query.yield_per(chunk_size))
+        custom_kwargs = custom_kwargs or {}
+
+        while True:
+            chunk = list(islice(raws, chunk_size))
+            if not chunk:
+                break
+            chunk = self.to_dicts(chunk, *custom_args, **custom_kwargs)
+            if chunked:
+                yield chunk
+            else:
+                for result in chunk:
+                    yield result
+
+    def to_json(
+        self, raws, fp=None, ndjson=False, chunk_size=1000,
+        custom_args=(), custom_kwargs=None
+    ):
+        """
+        Encode query results directly to JSON.
+        Intermediate dicts are not built, unless serializer
+        has custom or nested fields.
+
+        .. code:: python
+
+            data = serializator.to_json(
+                session.query(*serializator.get_query_fields())
+            )
+            # '[{"id":1,"name":"George"}]'
+
+            with open('export.ndjson', 'wb') as fp:
+                serializator.to_json(query, fp=fp, ndjson=True)
+
+        :param raws: query or iterable of query results
+        :type raws: sqlalchemy.orm.Query|list
+
+        :param fp:
+            binary file-like object to write to
+            - if None: encoded bytes are returned
+        :param bool ndjson:
+            if True: write newline-delimited objects instead of array
+        :param int chunk_size: count of raws encoded per write
+
+        :param tuple custom_args:
+            will be dispatched to custom_field functions
+        :param dict custom_kwargs:
+            will be dispatched to custom_field functions
+
+        :rtype: bytes|None
+        :return: JSON bytes if fp is None
+        """
+        output = io.BytesIO() if fp is None else fp
+
+        if self._is_columnar():
+            encode = self._get_json_encoder()
+
+            def encode_chunk(chunk):
+                return map(encode, self._prepare_raws(chunk))
+        else:
+            custom_kwargs = custom_kwargs or {}
+
+            def encode_chunk(chunk):
+                return map(
+                    encode_dict,
+                    self.to_dicts(chunk, *custom_args, **custom_kwargs)
+                )
+
+        separator = '\n' if ndjson else ','
+        if not ndjson:
+            output.write(b'[')
+
+        raws = iter(self._prepare_query(raws))
+        first = True
+        while True:
+            chunk = list(islice(raws, chunk_size))
+            if not chunk:
+                break
+            data = separator.join(encode_chunk(chunk))
+            if ndjson:
+                data += separator
+            elif not first:
+                data = separator + data
+            first = False
+            if not isinstance(data, bytes):
+                data = data.encode('utf-8')
+            output.write(data)
+
+        if not ndjson:
+            output.write(b']')
+
+        if fp is None:
+            return output.getvalue()
 
 
 class SQLAlchemyModelSerializator(SQLAlchemySerializator):
@@ -188,6 +1245,8 @@ class SQLAlchemyModelSerializator(SQLAlchemySerializator):
     1. Can inspect fields and hybrid fields of provided models
     2. Can serialize not only tuples,
         but model instance too.
+    3. Can serialize relationships of model instances
+        with child serializers.
 
     .. code:: python
 
@@ -196,11 +1255,41 @@ class SQLAlchemyModelSerializator(SQLAlchemySerializator):
         )
         user = session.query(User).first()
         data = serializer.to_dict(user)
+
+    To reuse dicts of model instances, set cache
+    (not supported for serializers with nested fields):
+
+    .. code:: python
+
+        cache = SerializationCache(maxsize=10000, ttl=60)
+        cache.listen(Session)
+        serializer = SqlAlchemySerializator(model=User, cache=cache)
+
+    Values of datetime, date, time, Decimal, UUID, Enum and LargeBinary
+    columns are converted to JSON compatible values by built-in
+    converters, unless serialize_<key> is defined.
+    Set convert_types to False to get values as is.
+
+    To serialize relationship, declare nested field.
+    Relationships are loaded with options from get_load_options,
+    so the whole query costs constant count of SQL statements:
+
+    .. code:: python
+
+        class UserSerializator(SQLAlchemyModelSerializator):
+            model = User
+            orders = SerializeNestedField(OrderSerializator, 'orders')
+
+        serializer = UserSerializator()
+        users = serializer.to_dicts(serializer.build_query(session))
     """
     fields = None
     to_inspect_fields = True
     to_inspect_hybrid_fields = True
     model = None
+    cache = None
+    prefer_sql_expressions = True
+    convert_types = True
 
     def __init__(
         self, *extra_fields,
@@ -213,13 +1302,28 @@ class SQLAlchemyModelSerializator(SQLAlchemySerializator):
             extra fields to extend class serializer fields
 
         :param kwargs:
-            class args: model, to_inspect_fields, to_inspect_hybrid_fields
+            class args: model, to_inspect_fields, to_inspect_hybrid_fields,
+            exclude, only, cache, prefer_sql_expressions, convert_types
 
         """
         self.model = self.__class__.model or kwargs.get('model', None)
         if not self.model:
             raise ValueError("set model class attribute")
 
+        cache = kwargs.get('cache', None)
+        self.cache = cache if cache is not None else self.__class__.cache
+        self._cache_token = object()
+
+        prefer_sql_expressions = kwargs.get('prefer_sql_expressions', None)
+        if prefer_sql_expressions is None:
+            prefer_sql_expressions = self.__class__.prefer_sql_expressions
+        self.prefer_sql_expressions = prefer_sql_expressions
+
+        convert_types = kwargs.get('convert_types', None)
+        if convert_types is None:
+            convert_types = self.__class__.convert_types
+        self.convert_types = convert_types
+
         class_to_inspect_fields = self.__class__.to_inspect_fields
         instance_to_inspect_fields = kwargs.get('to_inspect_fields', None)
 
@@ -241,9 +1345,220 @@ class SQLAlchemyModelSerializator(SQLAlchemySerializator):
         self.to_inspect_hybrid_fields = to_inspect_hybrid_fields
 
         super(SQLAlchemyModelSerializator, self).__init__(
-            *extra_fields
+            *extra_fields,
+            exclude=kwargs.get('exclude', None),
+            only=kwargs.get('only', None)
+        )
+        self._init_nested_serialize_fields()
+        if self.cache is not None and self.nested_serialize_fields:
+            # dicts of related instances would not be invalidated
+            raise ValueError(
+                "Cache can't be used by serializer with nested fields"
+            )
+        self._deserializers = {}
+        self._delta_plan = None
+
+    def _init_nested_serialize_fields(self):
+        relationships = inspect(self.model).relationships
+        nested_serialize_fields = []
+        for field in self.__class__._declared_nested_fields:
+            if not self._is_serialized(field.key):
+                continue
+            relationship = relationships.get(field.key)
+            if relationship is None:
+                raise ValueError(
+                    'Provide correct relationship key for nested field'
+                )
+
+            serializer = field.serializer
+            if isinstance(serializer, type):
+                serializer = serializer()
+            many = field.many
+            if many is None:
+                many = relationship.uselist
+
+            nested_serialize_fields.append(
+                (field.key, serializer, many, field.load)
+            )
+
+        self.nested_serialize_fields = nested_serialize_fields
+
+    def _is_tuple_serializable(self):
+        return (
+            not self.nested_serialize_fields and
+            not self.sql_custom_serialize_fields
+        )
+
+    def _init_converters(self):
+        """
+        Build converters of model instances too.
+        Values of custom fields with expressions are selected by query
+        for tuples, but evaluated with func for model instances.
+        """
+        super(SQLAlchemyModelSerializator, self)._init_converters()
+        self._convert_instance = self._convert
+        self._convert_instances = None
+        if not self.sql_custom_serialize_fields:
+            return
+
+        keys, funcs, custom_funcs = self._convert_plan
+        length = len(keys) - len(self.sql_custom_serialize_fields)
+        sql_custom_funcs = tuple(
+            (field.key, field.serialize)
+            for field in self.sql_custom_serialize_fields
+        )
+        if self.stats is not None:
+            sql_custom_funcs = tuple(
+                (key, self.stats.wrap_field(key, func))
+                for key, func in sql_custom_funcs
+            )
+        self._instance_convert_plan = (
+            keys[:length],
+            tuple(func for func in funcs if func[0] < length),
+            sql_custom_funcs + custom_funcs,
+        )
+        self._convert_instance = _build_row_converter(
+            *self._instance_convert_plan, hidden=self._hidden_keys
+        )
+        if self.stats is not None:
+            self._convert_instance = self.stats.wrap_converter(
+                self._convert_instance
+            )
+        self._get_attrs = _build_attr_getter(keys[:length])
+
+    def _get_instances_converter(self):
+        """
+        Return converter of model instances lists, build it on first call.
+
+        :rtype: function
+        """
+        if self._convert_instances is None:
+            convert_instances = _build_rows_converter(
+                *self._instance_convert_plan, hidden=self._hidden_keys
+            )
+            if self.stats is not None:
+                convert_instances = self.stats.wrap_converter(
+                    convert_instances, many=True
+                )
+            self._convert_instances = convert_instances
+        return self._convert_instances
+
+    def _prepare_query(self, raws):
+        """
+        Select serialized fields instead of model entity,
+        so hybrid fields and custom fields with expressions
+        are computed by database.
+        Query is not changed for serializers with nested fields or cache,
+        that need model instances.
+
+        :param raws: query or iterable of query results
+        """
+        if (
+            not self.prefer_sql_expressions or
+            self.nested_serialize_fields or
+            self.cache is not None or
+            not isinstance(raws, orm.Query) or
+            getattr(raws, '_with_options', None)
+        ):
+            return raws
+
+        descriptions = raws.column_descriptions
+        if len(descriptions) != 1 or descriptions[0]['expr'] is not self.model:
+            return raws
+        return raws.with_entities(*self.get_query_fields())
+
+    def _get_serialized_keys(self):
+        return (
+            super(SQLAlchemyModelSerializator, self)._get_serialized_keys() +
+            tuple(field[0] for field in self.nested_serialize_fields)
         )
 
+    def build_query(self, session, stream=False):
+        """
+        Return query, that selects all serialized fields.
+        If serializer has nested fields: query selects model
+        with relationship load options,
+        relationships loaded with contains_eager are outer joined.
+
+        :param sqlalchemy.orm.Session session:
+        :param bool stream:
+            if True: loaders are compatible with yield_per,
+            see get_load_options
+
+        :rtype: sqlalchemy.orm.Query
+        """
+        if not self.nested_serialize_fields:
+            return super(SQLAlchemyModelSerializator, self).build_query(
+                session
+            )
+        query = session.query(self.model)
+        for relationship in self.get_eager_joins(stream=stream):
+            query = query.outerjoin(relationship)
+        return query.options(*self.get_load_options(stream=stream))
+
+    def get_eager_joins(self, joined=True, stream=False):
+        """
+        Return relationships of nested fields(recursively),
+        that are loaded with contains_eager and should be joined to query.
+
+        :param bool joined: if False: parent relationship is not joined
+        :param bool stream: if True: loaders are replaced for yield_per
+
+        :rtype: list
+        :return: relationship attributes in join order
+        """
+        joins = []
+        for key, serializer, many, load in self.nested_serialize_fields:
+            if stream:
+                load = _get_stream_load(load, many, joined)
+            eager = load == 'contains_eager'
+            if eager and not joined:
+                raise ValueError(
+                    'Nested field {} can be loaded with contains_eager '
+                    'only under contains_eager parent'.format(key)
+                )
+            if eager:
+                joins.append(getattr(self.model, key))
+            joins.extend(
+                serializer.get_eager_joins(joined=eager, stream=stream)
+            )
+        return joins
+
+    def get_load_options(self, parent=None, stream=False, joined=True):
+        """
+        Return loader options for nested fields(recursively).
+
+        .. code:: python
+
+            session.query(User).options(
+                *serializator.get_load_options()
+            ).yield_per(1000)
+
+        Query.yield_per is not compatible with subqueryload
+        and with joined loading of collections,
+        so with stream they are replaced with selectinload.
+
+        :param parent: parent loader option to chain options from
+        :param bool stream: if True: loaders are replaced for yield_per
+        :param bool joined:
+            if False: parent relationship is not loaded by the query
+
+        :rtype: list
+        :return: loader options
+        """
+        options = []
+        for key, serializer, many, load in self.nested_serialize_fields:
+            if stream:
+                load = _get_stream_load(load, many, joined)
+            loader = getattr(orm if parent is None else parent, load)
+            option = loader(getattr(self.model, key))
+            options.extend(serializer.get_load_options(
+                parent=option, stream=stream,
+                joined=joined and load in ('joinedload', 'contains_eager')
+            ))
+            options.append(option)
+        return options
+
     def to_dict(self, raw, *custom_args, **custom_kwargs):
         """
         Return dict from sqlalchemy raw result.
@@ -265,40 +1580,559 @@ class SQLAlchemyModelSerializator(SQLAlchemySerializator):
         :rtype: dict
         :return: dict with keys associated to labels.
         """
-        result = {}
-        if isinstance(raw, tuple):
-            result = super(SQLAlchemyModelSerializator, self).to_dict(raw)
-        else:
-            for field in self.serialize_fields:
-                result[field.key] = field.serialize(
-                    getattr(raw, field.key)
-                )
-            for field in self.custom_serialize_fields:
-                result[field.key] = field.serialize(
-                    result, *custom_args, **custom_kwargs
-                )
+        if not _is_instance(raw):
+            self._check_no_nested_fields()
+            return self._convert(raw, custom_args, custom_kwargs)
+
+        cache = self.cache
+        if cache is not None and not custom_args and not custom_kwargs:
+            result = cache.get(raw, self._cache_token)
+            if result is not None:
+                return dict(result)
+
+        result = self._convert_instance(
+            self._get_attrs(raw), custom_args, custom_kwargs
+        )
+        if self.nested_serialize_fields:
+            self._serialize_nested([raw], [result])
+
+        if cache is not None and not custom_args and not custom_kwargs:
+            cache.set(raw, self._cache_token, dict(result))
         return result
 
+    def to_dicts(self, raws, *custom_args, **custom_kwargs):
+        """
+        Return list of dicts from sqlalchemy query or list of raws.
+        Nested fields are serialized in one to_dicts call per field.
+
+        :param raws: query or list of query results(models or tuples)
+        :type raws: sqlalchemy.orm.Query|list
+
+        :param custom_args:
+            will be dispatched to custom_field functions
+        :type custom_kwargs:
+            will be dispatched to custom_field functions
+
+        :rtype: list
+        :return: list of dicts with keys associated to labels.
+        """
+        raws = list(self._prepare_query(raws))
+        if (
+            self.cache is None or custom_args or custom_kwargs or
+            not raws or not _is_instance(raws[0])
+        ):
+            return self._to_dicts(raws, custom_args, custom_kwargs)
+
+        cache = self.cache
+        token = self._cache_token
+        results = []
+        missed = []
+        for i, raw in enumerate(raws):
+            result = cache.get(raw, token)
+            if result is None:
+                missed.append(i)
+            else:
+                result = dict(result)
+            results.append(result)
+
+        if missed:
+            serialized = self._to_dicts([raws[i] for i in missed], (), {})
+            for i, result in zip(missed, serialized):
+                cache.set(raws[i], token, dict(result))
+                results[i] = result
+        return results
+
+    def _to_dicts(self, raws, custom_args, custom_kwargs):
+        if not raws:
+            return []
+        if not _is_instance(raws[0]):
+            self._check_no_nested_fields()
+            return super(SQLAlchemyModelSerializator, self).to_dicts(
+                raws, *custom_args, **custom_kwargs
+            )
+
+        if self.sql_custom_serialize_fields:
+            get_attrs = self._get_attrs
+            results = self._get_instances_converter()(
+                [get_attrs(raw) for raw in raws], custom_args, custom_kwargs
+            )
+        else:
+            results = super(SQLAlchemyModelSerializator, self).to_dicts(
+                raws, *custom_args, **custom_kwargs
+            )
+        if self.nested_serialize_fields:
+            self._serialize_nested(raws, results)
+        return results
+
+    def _check_no_nested_fields(self):
+        if self.nested_serialize_fields:
+            raise ValueError(
+                'Nested fields can be serialized only from model instances'
+            )
+
+    def _serialize_nested(self, instances, results):
+        """
+        Serialize nested fields of instances into results.
+        Related objects of all instances are serialized at once.
+
+        :param list instances: model instances
+        :param list results: dicts of instances
+        """
+        for key, serializer, many, load in self.nested_serialize_fields:
+            values = [getattr(instance, key) for instance in instances]
+            if many:
+                related = [item for value in values for item in value]
+                serialized = iter(serializer.to_dicts(related))
+                for result, value in zip(results, values):
+                    result[key] = list(islice(serialized, len(value)))
+            else:
+                related = [value for value in values if value is not None]
+                serialized = iter(serializer.to_dicts(related))
+                for result, value in zip(results, values):
+                    result[key] = (
+                        next(serialized) if value is not None else None
+                    )
+
+    def _prepare_raws(self, raws):
+        """
+        Return list of tuples to be converted.
+        Shape of raws(model or tuple) is checked once by the first raw.
+
+        :param raws: query or iterable of query results(models or tuples)
+        :rtype: list
+        """
+        raws = list(raws)
+        if raws and _is_instance(raws[0]):
+            get_attrs = self._get_attrs
+            raws = [get_attrs(raw) for raw in raws]
+        return raws
+
+    def _get_delta_plan(self):
+        """
+        Return fields of delta, build it on first call.
+
+        :rtype: tuple
+        :return: identity keys, keys of columns and relationships,
+            (key, depends or None) of computed fields
+        """
+        if self._delta_plan is not None:
+            return self._delta_plan
+
+        mapper = inspect(self.model)
+        result_keys = self.get_result_keys()
+        identity_keys = tuple(
+            key for key in (
+                mapper.get_property_by_column(column).key
+                for column in mapper.primary_key
+            )
+            if key in result_keys
+        )
+        column_attrs = mapper.column_attrs
+        sql_custom_keys = frozenset(
+            field.key for field in self.sql_custom_serialize_fields
+        )
+        changed_keys = set()
+        computed = []
+        for field in self.serialize_fields:
+            if field.key in sql_custom_keys:
+                continue
+            if column_attrs.get(field.key) is not None:
+                changed_keys.add(field.key)
+            else:
+                # hybrid or labeled expression
+                computed.append((field.key, None))
+        changed_keys.update(field[0] for field in self.nested_serialize_fields)
+        computed.extend(
+            (field.key, field.depends) for field in (
+                self.custom_serialize_fields + self.sql_custom_serialize_fields
+            )
+        )
+
+        self._delta_plan = (
+            identity_keys, frozenset(changed_keys), tuple(computed)
+        )
+        return self._delta_plan
+
+    def get_changed_keys(self, instance):
+        """
+        Return keys of changed attributes of instance
+        since it was loaded or flushed.
+
+        :param instance: model instance
+
+        :rtype: frozenset
+        """
+        state = inspect(instance)
+        attrs = state.attrs
+        return frozenset(
+            key for key in state.committed_state
+            if attrs[key].history.has_changes()
+        )
+
+    def to_delta(self, instance, *custom_args, **custom_kwargs):
+        """
+        Serialize changed fields of instance.
+
+        Delta contains only identity(primary key) fields, changed fields
+        and computed fields, that depend on them:
+        custom fields with depends, that intersect changed fields,
+        custom fields without depends and hybrid fields
+        are serialized on any change.
+        Unchanged fields, that custom fields depend on
+        (all fields for custom fields without depends),
+        are selected for custom functions, but are not in delta.
+        Delta is serialized with serializer from with_fields,
+        so repeated sets of changed fields reuse serializers.
+        Use after_flush event or call before flush,
+        attributes history is reset after flush.
+
+        .. code:: python
+
+            guild.gold += 100
+            serializator.to_delta(guild)
+            # {'id': 1, 'gold': 200, 'is_rich': False}
+
+        :param instance: model instance
+
+        :rtype: dict|None
+        :return: None if instance has no changed fields
+        """
+        identity_keys, changed_keys, computed = self._get_delta_plan()
+        changed = self.get_changed_keys(instance).intersection(changed_keys)
+        if not changed:
+            return None
+
+        keys = set(identity_keys)
+        keys.update(changed)
+        for key, depends in computed:
+            if depends is None or not changed.isdisjoint(depends):
+                keys.add(key)
+        return self.with_fields(*keys).to_dict(
+            instance, *custom_args, **custom_kwargs
+        )
+
+    def to_identity(self, instance):
+        """
+        Serialize identity(primary key) fields of instance.
+
+        :param instance: model instance
+
+        :rtype: dict
+        """
+        return self.with_fields(*self._get_delta_plan()[0]).to_dict(instance)
+
+    def _get_deserializer(self, update):
+        """
+        Return converter of incoming dicts, build it on first call.
+        Serialized fields of model columns are converted
+        with deserialize_<key> method or field deserialize,
+        values of built-in type converters are converted back
+        with their inverse, see converters.get_type_deserializer.
+        Other serialized fields are read only and are skipped.
+
+        :param bool update:
+            if True: values are keyed by attributes(for bulk update),
+            else by table columns(for insert)
+
+        :rtype: function
+        """
+        deserializer = self._deserializers.get(update)
+        if deserializer is not None:
+            return deserializer
+
+        column_attrs = inspect(self.model).column_attrs
+        plan = {}
+        read_only = set()
+        for field in self.serialize_fields:
+            attr = column_attrs.get(field.key)
+            if attr is None:
+                read_only.add(field.key)
+                continue
+            func = getattr(self, 'deserialize_{}'.format(field.key), None)
+            if func is None:
+                func = field.get_deserialize_func()
+            if func is None and self.convert_types:
+                column_type = attr.columns[0].type
+                serialize_func = field.get_serialize_func()
+                if serialize_func is not None and \
+                        serialize_func is get_type_converter(column_type):
+                    func = get_type_deserializer(column_type)
+            target = attr.key if update else attr.columns[0].key
+            plan[field.key] = (target, func)
+        read_only.update(
+            field.key for field in self.custom_serialize_fields
+        )
+        read_only.update(
+            field.key for field in self.sql_custom_serialize_fields
+        )
+        read_only.update(field[0] for field in self.nested_serialize_fields)
+
+        deserializer = _build_row_deserializer(plan, frozenset(read_only))
+        self._deserializers[update] = deserializer
+        return deserializer
+
+    def from_dicts(self, session, dicts, update=False, batch_size=1000):
+        """
+        Write dicts to model table with batched statements.
+
+        Dicts are converted back with deserialize_<key> methods,
+        so result of to_dicts can be written as is.
+        New raws are inserted by Core insert with executemany,
+        existing raws are updated with bulk_update_mappings
+        and must contain primary key.
+        Dicts with the same keys are written together,
+        so order of writes is not kept.
+        Cached dicts of updated raws are dropped.
+        Session is not committed.
+
+        .. code:: python
+
+            class UserSerializator(SQLAlchemyModelSerializator):
+                model = User
+
+                def deserialize_created_on(self, value):
+                    return parse_datetime(value)
+
+            with create_session() as session:
+                serializator.from_dicts(session, dicts, batch_size=5000)
+                session.commit()
+
+        :param sqlalchemy.orm.Session session:
+        :param iterable dicts:
+        :param bool update: if True: update raws, else insert new raws
+        :param int batch_size: count of raws written by one statement
+
+        :rtype: int
+        :return: count of written raws
+        """
+        deserialize = self._get_deserializer(update)
+        mapper = inspect(self.model)
+        if update:
+            identity_keys = tuple(
+                mapper.get_property_by_column(column).key
+                for column in mapper.primary_key
+            )
+            primary_keys = frozenset(identity_keys)
+            cache = self.cache
+
+            def write(batch):
+                session.bulk_update_mappings(mapper, batch)
+                # bulk updates are not tracked by session events
+                if cache is not None:
+                    for values in batch:
+                        identity = mapper.identity_key_from_primary_key(
+                            [values[key] for key in identity_keys]
+                        )
+                        cache.invalidate_key(identity)
+        else:
+            primary_keys = frozenset()
+            statement = mapper.local_table.insert()
+
+            def write(batch):
+                session.execute(statement, batch)
+
+        batches = {}
+        count = 0
+        for data in dicts:
+            values = deserialize(data)
+            keys = frozenset(values)
+            if not primary_keys <= keys:
+                raise ValueError('Provide primary key to update raw')
+            batch = batches.get(keys)
+            if batch is None:
+                batch = batches[keys] = []
+            batch.append(values)
+            if len(batch) >= batch_size:
+                write(batch)
+                count += len(batch)
+                del batches[keys]
+
+        for batch in batches.values():
+            write(batch)
+            count += len(batch)
+        return count
+
     def _init_query_fields(
         self, extra_fields=None,
     ):
         super(SQLAlchemyModelSerializator, self)._init_query_fields(
             extra_fields=extra_fields,
         )
-        model = self.model
         if not self.query_fields:
-            if self.to_inspect_fields:
-                fields = get_columns(model).values()
-                self.query_fields.extend(fields)
-            if self.to_inspect_hybrid_fields:
-                hybrid_properties = get_hybrid_properties(model)
-                for key in hybrid_properties.keys():
-                    field = getattr(model, key)
+            self.query_fields = list(self._get_model_fields())
+
+    def _get_page_order(self):
+        return tuple(inspect(self.model).primary_key)
+
+    def _narrow(self):
+        super(SQLAlchemyModelSerializator, self)._narrow()
+        self.nested_serialize_fields = [
+            field for field in self.nested_serialize_fields
+            if self._is_serialized(field[0]) and
+            field[0] not in self._hidden_keys
+        ]
+        self._cache_token = object()
+        self._deserializers = {}
+        self._delta_plan = None
+
+    def _get_default_serialize_func(self, field):
+        """
+        Return built-in converter, chosen by type of field,
+        see converters.get_type_converter.
+
+        :param field: query field
+
+        :rtype: function|None
+        """
+        if not self.convert_types:
+            return None
+        return get_type_converter(getattr(field, 'type', None))
+
+    def _get_model_fields(self):
+        """
+        Return inspected fields of model.
+        Inspection result is cached in class field plans.
 
-                    field.key = key
-                    self.query_fields.append(field)
+        :rtype: tuple
+        :return: model columns and hybrid fields
+        """
+        model = self.model
+        plan_key = (
+            model, self.to_inspect_fields, self.to_inspect_hybrid_fields
+        )
+        plans = self.__class__._field_plans
+        fields = plans.get(plan_key)
+        if fields is not None:
+            return fields
+
+        columns, hybrid_fields = _inspect_model(model)
+        fields = []
+        if self.to_inspect_fields:
+            fields.extend(columns)
+        if self.to_inspect_hybrid_fields:
+            fields.extend(hybrid_fields)
+
+        fields = plans[plan_key] = tuple(fields)
+        return fields
 
 
 class Sequence(object):
-    # Not implemented
-    pass
+    """
+    Multi raws serializer.
+
+    Folds flat joined result of parent and child fields into
+    parent dicts with list of child dicts, so one-to-many data
+    is fetched with one JOIN.
+    Raws are grouped by parent index key in one pass,
+    so they may come in any order.
+
+    .. code:: python
+
+        sequence = Sequence(
+            UserSerializator(), OrderSerializator(), 'orders'
+        )
+        query = session.query(
+            *sequence.get_query_fields()
+        ).outerjoin(User.orders)
+        data = sequence.to_dicts(query)
+        # [{'name': 'George', 'orders': [{'id': 1}, {'id': 2}]}]
+    """
+    def __init__(
+        self, serializer, child_serializer, key,
+        index_key=None
+    ):
+        """
+        Build sequence serializer.
+
+        :param SQLAlchemySerializator serializer: parent serializer
+        :param SQLAlchemySerializator child_serializer: child serializer
+        :param str key: key of children list in parent dict
+
+        :param str index_key:
+            parent field key to group raws by
+            - if None: model primary key for model serializer,
+                first field otherwise
+        """
+        self.serializer = serializer
+        self.child_serializer = child_serializer
+        self.key = key
+
+        parent_keys = [field.key for field in serializer.serialize_fields]
+        if index_key is None:
+            model = getattr(serializer, 'model', None)
+            if model is not None:
+                mapper = inspect(model)
+                index_key = mapper.get_property_by_column(
+                    mapper.primary_key[0]
+                ).key
+            elif parent_keys:
+                index_key = parent_keys[0]
+        if index_key not in parent_keys:
+            raise ValueError('Index key should be serialized by serializer')
+
+        self.index_key = index_key
+        self._index = parent_keys.index(index_key)
+        self._parent_length = len(parent_keys)
+
+    def get_query_fields(self):
+        """
+        Return parent and child fields needed for query session.
+
+        :rtype: list
+        :return: query fields
+        """
+        return (
+            self.serializer.get_query_fields() +
+            self.child_serializer.get_query_fields()
+        )
+
+    def to_dicts(self, raws, *custom_args, **custom_kwargs):
+        """
+        Return list of parent dicts with children
+        from sqlalchemy query or list of raws.
+
+        :param raws: query or list of query results
+        :type raws: sqlalchemy.orm.Query|list
+
+        :param custom_args:
+            will be dispatched to custom_field functions
+        :type custom_kwargs:
+            will be dispatched to custom_field functions
+
+        :rtype: list
+        :return: list of parent dicts in order of first occurrence
+        """
+        index = self._index
+        length = self._parent_length
+        key = self.key
+
+        parent_raws = []
+        children_lists = []
+        child_raws = []
+        child_parents = []
+        children_by_index = {}
+        for raw in raws:
+            index_value = raw[index]
+            children = children_by_index.get(index_value)
+            if children is None:
+                children = children_by_index[index_value] = []
+                parent_raws.append(raw[:length])
+                children_lists.append(children)
+
+            child_raw = raw[length:]
+            if any(value is not None for value in child_raw):
+                child_raws.append(child_raw)
+                child_parents.append(children)
+
+        results = self.serializer.to_dicts(
+            parent_raws, *custom_args, **custom_kwargs
+        )
+        for result, children in zip(results, children_lists):
+            result[key] = children
+
+        serialized = self.child_serializer.to_dicts(
+            child_raws, *custom_args, **custom_kwargs
+        )
+        for children, child in zip(child_parents, serialized):
+            children.append(child)
+        return results
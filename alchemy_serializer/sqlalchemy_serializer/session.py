@@ -1,44 +1,159 @@
 # -*- coding: utf-8 -*-
-import logging
-from contextlib import closing
+import threading
+from contextlib import contextmanager
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 
-import settings
+from . import settings
 from .decorators import (
     sessioned as utils_sessioned
 )
 
-engine = create_engine(
-    settings.CONNECTION_STRING,
-    echo=True
-)
-Session = sessionmaker(bind=engine)
+_lock = threading.Lock()
+_options = {}
+_engine = None
+_session_factory = None
+
+
+def _get_options():
+    options = {
+        'connection_string': settings.CONNECTION_STRING,
+        'echo': settings.ECHO,
+        'pool_size': settings.POOL_SIZE,
+        'max_overflow': settings.MAX_OVERFLOW,
+        'pool_pre_ping': settings.POOL_PRE_PING,
+        'pool_recycle': settings.POOL_RECYCLE,
+        'scoped': settings.SCOPED_SESSION,
+    }
+    options.update(_options)
+    return options
+
+
+def configure(**options):
+    """
+    Configure engine and session factory.
+    Not passed options are taken from settings.
+    Engine is created on first use, current engine is disposed.
+
+    .. code:: python
+
+        configure(
+            connection_string='postgresql://localhost/db',
+            pool_size=20, max_overflow=10, pool_pre_ping=True
+        )
+
+    :param str connection_string: database url
+    :param bool echo: log statements
+    :param int pool_size:
+        count of kept connections
+        - if None: pool default
+    :param int max_overflow:
+        count of connections allowed over pool_size
+        - if None: pool default
+    :param bool pool_pre_ping: test connections on checkout
+    :param int pool_recycle: reconnect connections older than seconds
+    :param bool scoped:
+        if True: sessions are thread-local(scoped_session)
+
+    Other options are passed to create_engine.
+    """
+    dispose()
+    with _lock:
+        _options.clear()
+        _options.update(options)
+
+
+def dispose():
+    """
+    Close engine connections and drop engine and session factory.
+    They will be created again on next use.
+    """
+    global _engine, _session_factory
+    with _lock:
+        if _session_factory is not None and \
+                isinstance(_session_factory, scoped_session):
+            _session_factory.remove()
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _session_factory = None
+
+
+def _create_engine(options):
+    options = dict(options)
+    connection_string = options.pop('connection_string')
+    options.pop('scoped')
+    for key in ('pool_size', 'max_overflow'):
+        if options[key] is None:
+            del options[key]
+    return create_engine(connection_string, **options)
+
+
+def get_engine():
+    """
+    Return engine, create it on first call.
+
+    :rtype: sqlalchemy.engine.Engine
+    """
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = _create_engine(_get_options())
+    return _engine
+
+
+def get_session_factory():
+    """
+    Return session factory, create it on first call.
+
+    :rtype: sqlalchemy.orm.sessionmaker|sqlalchemy.orm.scoped_session
+    """
+    global _session_factory
+    if _session_factory is None:
+        engine = get_engine()
+        with _lock:
+            if _session_factory is None:
+                factory = sessionmaker(bind=engine)
+                if _get_options()['scoped']:
+                    factory = scoped_session(factory)
+                _session_factory = factory
+    return _session_factory
+
+
+@contextmanager
+def _session_scope(factory):
+    session = factory()
+    try:
+        yield session
+    finally:
+        if isinstance(factory, scoped_session):
+            factory.remove()
+        else:
+            session.close()
 
 
 def create_session(context_manager=True):
     """
     Create sqlalchemy session.
-    Wrapper on sessionmaker factory.
+    Wrapper on session factory.
 
     >>> with create_session() as session:
     >>>     do_smth()
 
     :param bool context_manager:
-        if True: will return closing context manager
+        if True: will return context manager, that closes session
+        (removes it, if sessions are scoped)
 
     :rtype: sqlalchemy.orm.session.Session
     :return: new session
     """
+    factory = get_session_factory()
     if context_manager:
-        return closing(Session())
+        return _session_scope(factory)
     else:
-        return Session()
+        return factory()
 
 
 sessioned = utils_sessioned(create_session)
-
-for name in ['sqlalchemy.engine.base.Engine']:
-    logger = logging.getLogger(name)
-    logger.disabled = settings.DISABLE_SQL_ALCHEMY_LOGGER
@@ -1,2 +1,8 @@
 CONNECTION_STRING = 'sqlite://'
-DISABLE_SQL_ALCHEMY_LOGGER = True
+ASYNC_CONNECTION_STRING = 'sqlite+aiosqlite://'
+ECHO = False
+POOL_SIZE = None
+MAX_OVERFLOW = None
+POOL_PRE_PING = False
+POOL_RECYCLE = -1
+SCOPED_SESSION = False
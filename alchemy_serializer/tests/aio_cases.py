@@ -0,0 +1,139 @@
+"""
+Asyncio tests, python 3.7+ and SQLAlchemy 1.4+ only.
+Uses python 3 syntax, so is imported by test_aio on python 3.7+.
+"""
+import asyncio
+import unittest
+
+from sqlalchemy import select
+
+try:
+    import aiosqlite  # noqa
+    from sqlalchemy_serializer import aio
+except ImportError:
+    aio = None
+
+from sqlalchemy_serializer import metadata, session as session_module
+
+from .models import Guild
+from .serializers import GuildSimpleSerializer, GuildModelSerializer
+
+
+@unittest.skipIf(aio is None, 'asyncio support is not available')
+class TestAsync(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.run_until_complete(self._run_sync(metadata.create_all))
+
+    def tearDown(self):
+        self.run_until_complete(self._run_sync(metadata.drop_all))
+        self.run_until_complete(aio.get_async_engine().dispose())
+        self.loop.close()
+
+    def run_until_complete(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    async def _run_sync(self, func):
+        async with aio.get_async_engine().begin() as connection:
+            await connection.run_sync(func)
+
+    async def _add_guilds(self, count, start=0):
+        @aio.sessioned
+        async def add_guilds(session=None, commit=True):
+            session.add_all([
+                Guild(name='test{}'.format(i), max_members=i)
+                for i in range(start, start + count)
+            ])
+            return session
+
+        return await add_guilds(commit=True)
+
+    async def _collect(self, serializer, **kwargs):
+        async with aio.create_async_session() as session:
+            return [
+                data async for data in
+                aio.aiter_dicts(serializer, session, **kwargs)
+            ]
+
+    def test_aiter_dicts(self):
+        self.run_until_complete(self._add_guilds(5))
+        serializer = GuildSimpleSerializer()
+
+        serialized = self.run_until_complete(
+            self._collect(serializer, chunk_size=2)
+        )
+        self.assertEqual(
+            [data['name'] for data in serialized],
+            ['test{}'.format(i) for i in range(5)]
+        )
+        self.assertEqual(serialized[3]['max_members'], 3)
+
+    def test_aiter_dicts_chunked(self):
+        self.run_until_complete(self._add_guilds(5))
+        serializer = GuildModelSerializer(only=['id', 'name'])
+
+        chunks = self.run_until_complete(
+            self._collect(serializer, chunk_size=2, chunked=True)
+        )
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+
+    def test_aiter_dicts_statement(self):
+        self.run_until_complete(self._add_guilds(5))
+        serializer = GuildModelSerializer()
+        statement = select(Guild).where(Guild.max_members > 2)
+
+        serialized = self.run_until_complete(
+            self._collect(serializer, statement=statement)
+        )
+        self.assertEqual(
+            [data['name'] for data in serialized], ['test3', 'test4']
+        )
+
+    def test_sessioned_commit_false(self):
+        @aio.sessioned
+        async def func(session=None, commit=None):
+            return session
+
+        with self.assertRaises(ValueError):
+            self.run_until_complete(func(commit=False))
+        self.assertIsNotNone(self.run_until_complete(func()))
+
+    def test_sessioned_scope(self):
+        async def add_guilds():
+            async with aio.sessioned.scope(commit=True) as session:
+                first = await self._add_guilds(2)
+                second = await self._add_guilds(3, start=2)
+                self.assertIs(session, first)
+                self.assertIs(session, second)
+
+        self.run_until_complete(add_guilds())
+        serialized = self.run_until_complete(
+            self._collect(GuildSimpleSerializer())
+        )
+        self.assertEqual(5, len(serialized))
+
+    def test_sessioned_explicit_session(self):
+        async def add_guilds():
+            async with aio.create_async_session() as session:
+                added = await self._add_guilds(2)
+                self.assertIsNot(session, added)
+
+                @aio.sessioned
+                async def func(session=None, commit=None):
+                    return await self._add_guilds(3, start=2)
+
+                added = await func(session=session)
+                self.assertIs(session, added)
+
+        self.run_until_complete(add_guilds())
+        serialized = self.run_until_complete(
+            self._collect(GuildSimpleSerializer())
+        )
+        self.assertEqual(5, len(serialized))
+
+    def test_sync_sessioned_coroutine(self):
+        async def func(session=None, commit=None):
+            return session
+
+        with self.assertRaises(TypeError):
+            session_module.sessioned(func)
@@ -0,0 +1,295 @@
+"""
+Serializers benchmarks.
+
+Serializers are compared with hand-written Guild.to_dict
+and Guild.to_dict_with_hybrid on SQLite in-memory database.
+Results are reported in raws per second and peak allocated memory
+(python 3 only, measured with tracemalloc).
+
+Run from alchemy_serializer directory:
+
+    python -m tests.benchmarks
+"""
+import datetime
+import hashlib
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from sqlalchemy_serializer import metadata
+from sqlalchemy_serializer.session import create_session, get_engine
+
+from .models import Guild
+from .serializers import (
+    GuildSimpleSerializer, GuildCustomSerializer,
+    GuildHybridSerializer, GuildModelSerializer
+)
+
+
+def bench(func, number):
+    """
+    Return best time of single func call in microseconds.
+
+    :param function func:
+    :param int number: calls count in one repeat
+
+    :rtype: float
+    """
+    func()
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def bench_construction(number=2000):
+    """
+    Measure serializer construction cost.
+
+    :param int number: constructions count in one repeat
+
+    :rtype: list
+    :return: (name, microseconds per construction) tuples
+    """
+    return [
+        (serializer_class.__name__, bench(serializer_class, number))
+        for serializer_class in (
+            GuildSimpleSerializer, GuildCustomSerializer,
+            GuildHybridSerializer, GuildModelSerializer,
+        )
+    ]
+
+
+def measure_allocations(func, *args):
+    """
+    Return peak memory allocated by func call.
+
+    :param function func:
+
+    :rtype: int|None
+    :return: bytes, None if tracemalloc is not available
+    """
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_raws(func, raws, repeat=3):
+    """
+    Measure serialization speed of func(raws).
+
+    :param function func: serializes list of raws
+    :param list raws:
+    :param int repeat:
+
+    :rtype: tuple
+    :return: (raws per second, peak allocated bytes or None)
+    """
+    seconds = min(timeit.repeat(lambda: func(raws), number=1, repeat=repeat))
+    return len(raws) / seconds, measure_allocations(func, raws)
+
+
+def populate(session, count):
+    """
+    Replace guilds in database with count new guilds.
+
+    :param sqlalchemy.orm.Session session:
+    :param int count:
+    """
+    session.query(Guild).delete()
+    session.add_all([
+        Guild(
+            name='guild{}'.format(i),
+            gold=i * 10,
+            level=i % 50,
+            max_members=10
+        )
+        for i in range(count)
+    ])
+    session.commit()
+
+
+def get_to_dict_cases():
+    """
+    Return serialization cases.
+
+    :rtype: list
+    :return: (name, input, func) tuples
+        - input: 'model' for Guild instances,
+            serializer to query tuples of its fields
+    """
+    simple = GuildSimpleSerializer()
+    hybrid = GuildHybridSerializer()
+    custom = GuildCustomSerializer()
+    model = GuildModelSerializer()
+    narrow = GuildModelSerializer(only=['id', 'name'])
+
+    def map_to_dict(to_dict):
+        return lambda raws: [to_dict(raw) for raw in raws]
+
+    return [
+        ('Guild.to_dict', 'model', map_to_dict(Guild.to_dict)),
+        (
+            'Guild.to_dict_with_hybrid', 'model',
+            map_to_dict(Guild.to_dict_with_hybrid)
+        ),
+        ('Simple.to_dict', simple, map_to_dict(simple.to_dict)),
+        ('Simple.to_dicts', simple, simple.to_dicts),
+        ('Simple.to_json', simple, simple.to_json),
+        ('Hybrid.to_dict', hybrid, map_to_dict(hybrid.to_dict)),
+        ('Custom.to_dict', custom, map_to_dict(custom.to_dict)),
+        ('Custom.to_dicts', custom, custom.to_dicts),
+        ('Model.to_dict(tuple)', model, map_to_dict(model.to_dict)),
+        ('Model.to_dict(model)', 'model', map_to_dict(model.to_dict)),
+        ('Model.to_dicts(model)', 'model', model.to_dicts),
+        ('Narrow Model.to_dicts(tuple)', narrow, narrow.to_dicts),
+    ]
+
+
+def bench_to_dict(counts=(100, 1000, 10000)):
+    """
+    Measure serialization of different result sizes.
+
+    :param tuple counts: raws counts
+
+    :rtype: list
+    :return: (name, count, raws per second, peak bytes) tuples
+    """
+    results = []
+    metadata.create_all(get_engine())
+    try:
+        with create_session() as session:
+            for count in counts:
+                populate(session, count)
+                for name, source, func in get_to_dict_cases():
+                    if source == 'model':
+                        raws = session.query(Guild).all()
+                    else:
+                        raws = session.query(
+                            *source.get_query_fields()
+                        ).all()
+                    speed, allocated = bench_raws(func, raws)
+                    results.append((name, count, speed, allocated))
+                    session.expunge_all()
+    finally:
+        metadata.drop_all(get_engine())
+    return results
+
+
+class GuildHashSerializer(GuildSimpleSerializer):
+    """
+    Serializer with CPU-bound serialize function.
+    """
+    def serialize_name(self, value):
+        for _ in range(100):
+            value = hashlib.sha1(value.encode('utf-8')).hexdigest()
+        return value
+
+
+def make_guild_raws(count):
+    """
+    Return raws, as they are returned by GuildSimpleSerializer query.
+
+    :param int count:
+
+    :rtype: list
+    """
+    created_on = datetime.datetime(2000, 1, 1)
+    return [
+        (i, 'guild{}'.format(i), i * 10, i % 50, 10, created_on)
+        for i in range(count)
+    ]
+
+
+def bench_parallel(count=50000, chunk_size=5000):
+    """
+    Measure to_dicts_parallel scaling by processes count.
+
+    :param int count: raws count
+    :param int chunk_size: raws count per worker task
+
+    :rtype: list
+    :return: (processes, raws per second) tuples
+    """
+    serializer = GuildHashSerializer()
+    raws = make_guild_raws(count)
+    results = []
+    processes = 1
+    while processes <= multiprocessing.cpu_count():
+        start = time.time()
+        serializer.to_dicts_parallel(
+            raws, processes=processes, chunk_size=chunk_size, min_raws=1
+        )
+        results.append((processes, count / (time.time() - start)))
+        processes *= 2
+    return results
+
+
+IMPORT_STATEMENT = (
+    'import sqlalchemy_serializer.serializers, sqlalchemy_serializer.session'
+)
+
+
+def bench_import():
+    """
+    Measure import time of package with python -X importtime.
+
+    :rtype: list|None
+    :return: (module, self microseconds, cumulative microseconds) tuples
+        of package modules, None if -X importtime is not supported
+    """
+    if sys.version_info < (3, 7):
+        return None
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', IMPORT_STATEMENT],
+        stderr=subprocess.STDOUT,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ).decode('utf-8')
+    results = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, cumulative, module = line[len('import time:'):].split('|')
+        module = module.strip()
+        if module.split('.')[0] == 'sqlalchemy_serializer':
+            results.append((module, int(own), int(cumulative)))
+    return results
+
+
+def main():
+    imports = bench_import()
+    if imports is not None:
+        print('import:')
+        for module, own, cumulative in imports:
+            print('  {:<36} {:>8} us {:>8} us cumulative'.format(
+                module, own, cumulative
+            ))
+
+    print('construction:')
+    for name, usec in bench_construction():
+        print('  {:<28} {:>8.2f} us'.format(name, usec))
+
+    print('serialization:')
+    for name, count, speed, allocated in bench_to_dict():
+        print('  {:<28} {:>6} raws {:>12.0f} raws/s {:>10} KiB'.format(
+            name, count, speed,
+            '-' if allocated is None else allocated // 1024
+        ))
+
+    print('parallel to_dicts(heavy serialize function):')
+    for processes, speed in bench_parallel():
+        print('  {:>2} processes {:>12.0f} raws/s'.format(processes, speed))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,10 +5,10 @@ from sqlalchemy import (
     Boolean, Text, update
 )
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from sqlalchemy_serializer import Base
-from sqlalchemy_serializer.decorators import sessioned
+from sqlalchemy_serializer.session import sessioned
 
 
 class Guild(Base):
@@ -40,7 +40,7 @@ class Guild(Base):
         name='test',
         gold=0,
         session=None,
-        commit=True
+        commit=None
     ):
         member = GuildMember(
             guild=self,
@@ -48,7 +48,6 @@ class Guild(Base):
             gold=gold,
         )
         session.add(member)
-        session.commit()
 
         return member
 
@@ -101,4 +100,7 @@ class GuildMember(Base):
         DateTime, nullable=False,
         default=datetime.datetime.now
     )
-    guild = relationship(u'Guild', primaryjoin='GuildMember.guild_id == Guild.id')
+    guild = relationship(
+        u'Guild', primaryjoin='GuildMember.guild_id == Guild.id',
+        backref=backref('members', order_by='GuildMember.id')
+    )
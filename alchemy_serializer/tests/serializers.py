@@ -1,10 +1,16 @@
+import datetime
+
+from sqlalchemy import String, cast
+
 from sqlalchemy_serializer.serializers import (
     SQLAlchemySerializator,
     SQLAlchemyModelSerializator
 )
-from sqlalchemy_serializer.fields import SerializeCustomModelField
+from sqlalchemy_serializer.fields import (
+    SerializeField, SerializeCustomModelField, SerializeNestedField
+)
 
-from .models import Guild
+from .models import Guild, GuildMember
 
 
 class GuildSimpleSerializer(SQLAlchemySerializator):
@@ -41,7 +47,18 @@ def gold_and_level(result):
 
 
 class GuildCustomSerializer(GuildSimpleSerializer):
-    gold_and_level = SerializeCustomModelField(gold_and_level, 'gold_and_level')
+    gold_and_level = SerializeCustomModelField(
+        gold_and_level, 'gold_and_level', depends=('gold', 'level')
+    )
+
+
+class GuildModelCustomSerializer(SQLAlchemyModelSerializator):
+    model = Guild
+    exclude = ['created_on']
+    # without depends: any field can be used
+    gold_and_level = SerializeCustomModelField(
+        gold_and_level, 'gold_and_level'
+    )
 
 
 class GuildModelSerializer(SQLAlchemyModelSerializator):
@@ -50,6 +67,65 @@ class GuildModelSerializer(SQLAlchemyModelSerializator):
     def serialize_created_on(self, value):
         return value.isoformat()
 
+    def deserialize_created_on(self, value):
+        if '.' in value:
+            return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f')
+        return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S')
+
 
 class GuildModelSerializerOffHybrid(GuildModelSerializer):
     to_inspect_hybrid_fields = False
+
+
+class GuildSingleFieldSerializer(GuildModelSerializer):
+    fields = [
+        Guild.name,
+    ]
+
+
+class GuildModelSerializerExclude(GuildModelSerializer):
+    exclude = ['created_on', 'is_rich']
+
+
+class GuildMemberSerializer(SQLAlchemyModelSerializator):
+    model = GuildMember
+    exclude = ['guild_id', 'created_on']
+
+
+class GuildMemberWithGuildSerializer(GuildMemberSerializer):
+    guild = SerializeNestedField(GuildModelSerializer, 'guild')
+
+
+class GuildWithMembersSerializer(GuildModelSerializer):
+    members = SerializeNestedField(GuildMemberWithGuildSerializer, 'members')
+
+
+class GuildWithMembersEagerSerializer(GuildModelSerializer):
+    members = SerializeNestedField(
+        GuildMemberSerializer, 'members', load='contains_eager'
+    )
+
+
+class GuildPrefixSerializer(GuildSimpleSerializer):
+    name = SerializeField('name')
+    title = SerializeCustomModelField('get_title', 'title')
+
+    def __init__(self, prefix, *extra_fields, **kwargs):
+        self.prefix = prefix
+        super(GuildPrefixSerializer, self).__init__(*extra_fields, **kwargs)
+
+    def serialize_name(self, value):
+        return self.prefix + value
+
+    def get_title(self, result):
+        return '{} {}'.format(self.prefix, result['level'])
+
+
+class GuildModelSqlCustomSerializer(GuildModelSerializer):
+    gold_and_level = SerializeCustomModelField(
+        gold_and_level, 'gold_and_level',
+        expression=(
+            cast(Guild.gold, String) + ': ' + cast(Guild.level, String)
+        ),
+        depends=('gold', 'level')
+    )
@@ -1,22 +1,59 @@
+import collections
+import datetime
+import decimal
+import io
+from array import array
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
+import uuid
+from multiprocessing.pool import ThreadPool
+from operator import itemgetter
 
-from sqlalchemy_serializer.session import create_session, engine
-from sqlalchemy_serializer import metadata
+from sqlalchemy import event, inspect, types
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.pool import QueuePool
+from sqlalchemy_utils import UUIDType
 
-from .models import Guild
+from sqlalchemy_serializer import session as session_module
+from sqlalchemy_serializer.session import (
+    create_session, get_engine, sessioned
+)
+from sqlalchemy_serializer import Base, metadata
+from sqlalchemy_serializer.cache import LRUCache, SerializationCache
+from sqlalchemy_serializer.converters import (
+    get_type_converter, get_type_deserializer
+)
+from sqlalchemy_serializer.delta import DeltaCollector
+from sqlalchemy_serializer.encoders import build_row_encoder, encode_value
+from sqlalchemy_serializer.fields import SerializeNestedField
+from sqlalchemy_serializer.registry import SerializerRegistry
+from sqlalchemy_serializer.serializers import (
+    Sequence, SQLAlchemyModelSerializator
+)
+
+from .models import Guild, GuildMember
 from .serializers import (
     GuildSimpleSerializer, GuildCustomSerializer,
     GuildHybridSerializer, gold_and_level,
-    GuildModelSerializer, GuildModelSerializerOffHybrid
+    GuildModelSerializer, GuildModelSerializerOffHybrid,
+    GuildSingleFieldSerializer, GuildModelSerializerExclude,
+    GuildWithMembersSerializer, GuildMemberSerializer,
+    GuildPrefixSerializer, GuildModelSqlCustomSerializer,
+    GuildWithMembersEagerSerializer, GuildModelCustomSerializer
 )
 
 
 class BaseTest(unittest.TestCase):
     def setUp(self):
-        metadata.create_all(engine)
+        metadata.create_all(get_engine())
 
     def tearDown(self):
-        metadata.drop_all(engine)
+        metadata.drop_all(get_engine())
 
 
 class TestSerializer(BaseTest):
@@ -41,7 +78,7 @@ class TestSerializer(BaseTest):
                 *serializer.get_query_fields()
             ).all()
 
-            serialized = map(serializer.to_dict, data)
+            serialized = list(map(serializer.to_dict, data))
             self.assertIn(acc1.to_dict(), serialized)
             self.assertIn(acc2.to_dict(), serialized)
 
@@ -67,7 +104,7 @@ class TestSerializer(BaseTest):
                 *serializer.get_query_fields()
             ).all()
 
-            serialized = map(serializer.to_dict, data)
+            serialized = list(map(serializer.to_dict, data))
             acc1_dict = acc1.to_dict()
             acc1_dict['single_guild'] = True
             acc2_dict = acc2.to_dict()
@@ -114,6 +151,264 @@ class TestSerializer(BaseTest):
 
             acc2_dict['gold_and_level'] = gold_and_level(acc2_dict)
             self.assertEqual(acc2_dict, serialized)
+
+    def test_to_dicts(self):
+        with create_session() as session:
+            acc1 = Guild(
+                name='test1',
+                max_members=2
+            )
+            acc2 = Guild(
+                name='test2',
+                max_members=2
+            )
+
+            session.add(acc1)
+            session.add(acc2)
+            session.commit()
+
+            serializer = GuildCustomSerializer()
+            query = session.query(
+                *serializer.get_query_fields()
+            ).order_by(Guild.id)
+
+            serialized = serializer.to_dicts(query)
+            self.assertEqual(
+                list(map(serializer.to_dict, query.all())),
+                serialized
+            )
+            self.assertEqual(
+                gold_and_level(acc1.to_dict()),
+                serialized[0]['gold_and_level']
+            )
+            self.assertEqual([], serializer.to_dicts([]))
+
+    def test_to_json(self):
+        with create_session() as session:
+            acc1 = Guild(
+                name=u'test\u0444"1',
+                max_members=2
+            )
+            acc2 = Guild(
+                name='test2',
+                max_members=2
+            )
+
+            session.add(acc1)
+            session.add(acc2)
+            session.commit()
+
+            for serializer in (GuildHybridSerializer(), GuildCustomSerializer()):
+                query = session.query(
+                    *serializer.get_query_fields()
+                ).order_by(Guild.id)
+                expected = serializer.to_dicts(query)
+
+                data = serializer.to_json(query, chunk_size=1)
+                self.assertTrue(isinstance(data, bytes))
+                self.assertEqual(expected, json.loads(data.decode('utf-8')))
+
+                fp = io.BytesIO()
+                serializer.to_json(query, fp=fp, ndjson=True)
+                lines = fp.getvalue().decode('utf-8').splitlines()
+                self.assertEqual(expected, list(map(json.loads, lines)))
+
+            self.assertEqual(b'[]', serializer.to_json([]))
+
+    def test_encode_nested(self):
+        value = decimal.Decimal('0.10000000000000000001')
+        date = datetime.date(2020, 1, 2)
+        self.assertEqual('0.10000000000000000001', encode_value(value))
+        self.assertEqual(
+            '{"items":[0.10000000000000000001,"2020-01-02"],'
+            '"1":{"2":null}}',
+            encode_value(
+                collections.OrderedDict([
+                    ('items', [value, date]), (1, {2: None})
+                ])
+            )
+        )
+        self.assertEqual('[[true],1.5]', encode_value(([True], 1.5)))
+        self.assertRaises(ValueError, encode_value, [float('nan')])
+        self.assertRaises(TypeError, encode_value, [object()])
+
+    def test_encode_non_finite(self):
+        self.assertEqual('1.5', encode_value(1.5))
+        self.assertEqual('1.50', encode_value(decimal.Decimal('1.50')))
+        for value in (
+            float('inf'), float('-inf'), float('nan'),
+            decimal.Decimal('Infinity'), decimal.Decimal('NaN'),
+        ):
+            self.assertRaises(ValueError, encode_value, value)
+            self.assertRaises(
+                ValueError, build_row_encoder(('value',), (None,)), (value,)
+            )
+
+    def test_to_dicts_parallel(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2, level=i)
+                for i in range(10)
+            ]
+            session.add_all(guilds)
+            session.commit()
+
+            serializer = GuildCustomSerializer()
+            data = session.query(
+                *serializer.get_query_fields()
+            ).order_by(Guild.id).all()
+
+            self.assertEqual(
+                serializer.to_dicts(data),
+                serializer.to_dicts_parallel(
+                    data, processes=2, chunk_size=3, min_raws=1
+                )
+            )
+            self.assertEqual(
+                serializer.to_dicts(data),
+                serializer.to_dicts_parallel(data)
+            )
+
+            serializer = GuildModelSerializer()
+            data = session.query(Guild).order_by(Guild.id).all()
+            self.assertEqual(
+                serializer.to_dicts(data),
+                serializer.to_dicts_parallel(
+                    data, processes=2, chunk_size=4, min_raws=1
+                )
+            )
+
+    def test_to_tuples_and_columns(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2, level=i)
+                for i in range(3)
+            ]
+            session.add_all(guilds)
+            session.commit()
+
+            for serializer in (GuildHybridSerializer(), GuildCustomSerializer()):
+                query = session.query(
+                    *serializer.get_query_fields()
+                ).order_by(Guild.id)
+                expected = serializer.to_dicts(query)
+
+                header, rows = serializer.to_tuples(query)
+                self.assertEqual(
+                    expected, [dict(zip(header, row)) for row in rows]
+                )
+
+                columns = serializer.to_columns(query)
+                self.assertEqual(
+                    dict(
+                        (key, [result[key] for result in expected])
+                        for key in header
+                    ),
+                    columns
+                )
+
+                columns = serializer.to_columns(query, arrays=True)
+                self.assertEqual(array('l', [0, 1, 2]), columns['level'])
+                self.assertEqual(
+                    [result['name'] for result in expected], columns['name']
+                )
+
+            serializer = GuildModelSerializer()
+            header, rows = serializer.to_tuples([])
+            self.assertIn('is_rich', header)
+            self.assertEqual([], rows)
+            self.assertEqual(
+                dict((key, []) for key in header), serializer.to_columns([])
+            )
+
+    def test_stats(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2)
+                for i in range(3)
+            ]
+            session.add_all(guilds)
+            session.commit()
+
+            serializer = GuildCustomSerializer()
+            self.assertIsNone(serializer.get_stats())
+
+            fields = []
+            serializer.enable_stats(
+                on_field=lambda key, seconds: fields.append(key)
+            )
+            query = session.query(*serializer.get_query_fields())
+            serializer.to_dict(query.first())
+            serialized = serializer.to_dicts(query)
+            serializer.to_json(query)
+
+            stats = serializer.get_stats()
+            self.assertEqual(7, stats['raws'])
+            self.assertTrue(stats['seconds'] > 0)
+            self.assertEqual(
+                set(['created_on', 'gold_and_level']),
+                set(stats['fields'])
+            )
+            self.assertEqual(7, stats['fields']['created_on']['calls'])
+            self.assertEqual(14, len(fields))
+
+            serializer.disable_stats()
+            self.assertIsNone(serializer.get_stats())
+            self.assertEqual(serialized, serializer.to_dicts(query))
+
+    def test_thread_safety(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2, level=i)
+                for i in range(50)
+            ]
+            session.add_all(guilds)
+            session.commit()
+
+            serializers = [
+                GuildPrefixSerializer('first'),
+                GuildPrefixSerializer('second'),
+            ]
+            data = session.query(
+                *serializers[0].get_query_fields()
+            ).all()
+
+            def get_expected(prefix):
+                expected = []
+                for guild in guilds:
+                    guild_dict = guild.to_dict()
+                    guild_dict['name'] = prefix + guild.name
+                    guild_dict['title'] = '{} {}'.format(prefix, guild.level)
+                    expected.append(guild_dict)
+                return expected
+
+            expected = dict(
+                (serializer.prefix, get_expected(serializer.prefix))
+                for serializer in serializers
+            )
+
+            def serialize(i):
+                serializer = serializers[i % 2]
+                if i % 3:
+                    serialized = list(map(serializer.to_dict, data))
+                else:
+                    serialized = serializer.to_dicts(data)
+                return serialized == expected[serializer.prefix]
+
+            pool = ThreadPool(8)
+            try:
+                results = pool.map(serialize, range(200))
+            finally:
+                pool.close()
+                pool.join()
+            self.assertTrue(all(results))
+
+            self.assertIsNot(
+                GuildPrefixSerializer.name, serializers[0].serialize_fields[1]
+            )
+            self.assertEqual(
+                'get_title', GuildPrefixSerializer.title.func
+            )
     # test extra_hybrid
     # test join
     # test serialize field in Serializator class
@@ -142,14 +437,14 @@ class TestModelSerializer(BaseTest):
                 *serializer.get_query_fields()
             ).all()
 
-            serialized = map(serializer.to_dict, data)
+            serialized = list(map(serializer.to_dict, data))
             self.assertIn(acc1.to_dict_with_hybrid(), serialized)
             self.assertIn(acc2.to_dict_with_hybrid(), serialized)
 
             # Test with model query
             data = session.query(Guild).all()
 
-            serialized = map(serializer.to_dict, data)
+            serialized = list(map(serializer.to_dict, data))
             self.assertIn(acc1.to_dict_with_hybrid(), serialized)
             self.assertIn(acc2.to_dict_with_hybrid(), serialized)
 
@@ -174,7 +469,7 @@ class TestModelSerializer(BaseTest):
                 Guild
             ).all()
 
-            serialized = map(serializer.to_dict, data)
+            serialized = list(map(serializer.to_dict, data))
             acc1_dict = acc1.to_dict()
             acc2_dict = acc2.to_dict()
             self.assertIn(acc1_dict, serialized)
@@ -187,11 +482,1155 @@ class TestModelSerializer(BaseTest):
                 Guild
             ).all()
 
-            serialized = map(serializer.to_dict, data)
+            serialized = list(map(serializer.to_dict, data))
             self.assertIn(acc1.to_dict(), serialized)
             self.assertIn(acc2.to_dict(), serialized)
+
+    def test_model_serializer_to_dicts(self):
+        with create_session() as session:
+            acc1 = Guild(
+                name='test1',
+                max_members=2
+            )
+            acc2 = Guild(
+                name='test2',
+                max_members=2
+            )
+
+            session.add(acc1)
+            session.add(acc2)
+            session.commit()
+
+            serializer = GuildModelSerializer()
+            expected = [acc1.to_dict_with_hybrid(), acc2.to_dict_with_hybrid()]
+
+            data = session.query(Guild).order_by(Guild.id)
+            self.assertEqual(expected, serializer.to_dicts(data))
+
+            data = session.query(
+                *serializer.get_query_fields()
+            ).order_by(Guild.id)
+            self.assertEqual(expected, serializer.to_dicts(data))
+
+    def test_model_serializer_iter_dicts(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2)
+                for i in range(5)
+            ]
+            session.add_all(guilds)
+            session.commit()
+
+            serializer = GuildModelSerializer()
+            expected = [guild.to_dict_with_hybrid() for guild in guilds]
+
+            data = serializer.iter_dicts(
+                session.query(Guild).order_by(Guild.id),
+                chunk_size=2
+            )
+            self.assertFalse(isinstance(data, list))
+            self.assertEqual(expected, list(data))
+
+            chunks = list(
+                serializer.iter_dicts(session, chunk_size=2, chunked=True)
+            )
+            self.assertEqual([2, 2, 1], list(map(len, chunks)))
+            by_id = itemgetter('id')
+            self.assertEqual(
+                sorted(expected, key=by_id),
+                sorted(sum(chunks, []), key=by_id)
+            )
+
+            # loaders, that are not compatible with yield_per, are replaced
+            for guild in guilds[:3]:
+                guild.add_member(name='member' + guild.name, session=session)
+                guild.add_member(name='other' + guild.name, session=session)
+            session.commit()
+            session.expunge_all()
+            expected = GuildWithMembersEagerSerializer().to_dicts(
+                session.query(Guild).options(selectinload(Guild.members))
+            )
+            for load in ('joinedload', 'subqueryload', 'contains_eager'):
+                class LoadSerializer(GuildModelSerializer):
+                    members = SerializeNestedField(
+                        GuildMemberSerializer, 'members', load=load
+                    )
+
+                serializer = LoadSerializer()
+                self.assertEqual(
+                    sorted(expected, key=by_id),
+                    sorted(
+                        serializer.iter_dicts(session, chunk_size=2),
+                        key=by_id
+                    )
+                )
+                self.assertEqual([], serializer.get_eager_joins(stream=True))
+
+    def test_model_serializer_field_plan_cache(self):
+        serializer1 = GuildModelSerializer()
+        serializer2 = GuildModelSerializer()
+        self.assertEqual(
+            list(map(id, serializer1.get_query_fields())),
+            list(map(id, serializer2.get_query_fields()))
+        )
+        self.assertIsNot(
+            serializer1.get_query_fields(), serializer2.get_query_fields()
+        )
+
+        serializer = GuildModelSerializer(to_inspect_hybrid_fields=False)
+        self.assertNotIn(
+            'is_rich', [field.key for field in serializer.get_query_fields()]
+        )
+
+    def test_model_serializer_exclude(self):
+        with create_session() as session:
+            acc1 = Guild(
+                name='test1',
+                max_members=2
+            )
+
+            session.add(acc1)
+            session.commit()
+
+            serializer = GuildModelSerializerExclude()
+            query = session.query(*serializer.get_query_fields())
+            self.assertNotIn('created_on', str(query))
+
+            acc1_dict = acc1.to_dict()
+            del acc1_dict['created_on']
+            self.assertEqual(acc1_dict, serializer.to_dict(query.first()))
+            self.assertEqual(
+                acc1_dict, serializer.to_dict(session.query(Guild).first())
+            )
+
+            serializer = GuildModelSerializer(only=['id', 'name'])
+            query = session.query(*serializer.get_query_fields())
+            self.assertEqual(
+                {'id': acc1.id, 'name': 'test1'},
+                serializer.to_dict(query.first())
+            )
+
+            serializer = GuildCustomSerializer(exclude=['gold_and_level'])
+            self.assertEqual(
+                acc1.to_dict(),
+                serializer.to_dict(
+                    session.query(*serializer.get_query_fields()).first()
+                )
+            )
+
+    def test_model_serializer_nested_fields(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2)
+                for i in range(3)
+            ]
+            session.add_all(guilds)
+            for i, guild in enumerate(guilds[:2]):
+                guild.members.append(GuildMember(name='member{}'.format(i)))
+                guild.members.append(GuildMember(name='other{}'.format(i)))
+            session.commit()
+
+            serializer = GuildWithMembersSerializer()
+            expected = []
+            for guild in guilds:
+                guild_dict = guild.to_dict_with_hybrid()
+                guild_dict['members'] = [
+                    {
+                        'id': member.id,
+                        'name': member.name,
+                        'gold': member.gold,
+                        'guild': guild.to_dict_with_hybrid(),
+                    }
+                    for member in guild.members
+                ]
+                expected.append(guild_dict)
+            session.expunge_all()
+
+            statements = []
+
+            def count_statement(*args):
+                statements.append(args)
+
+            engine = get_engine()
+            event.listen(engine, 'before_cursor_execute', count_statement)
+            try:
+                serialized = serializer.to_dicts(
+                    serializer.build_query(session).order_by(Guild.id)
+                )
+            finally:
+                event.remove(engine, 'before_cursor_execute', count_statement)
+
+            self.assertEqual(expected, serialized)
+            # guilds, members, guilds of members
+            self.assertEqual(3, len(statements))
+
+            guild = session.query(Guild).get(expected[0]['id'])
+            self.assertEqual(expected[0], serializer.to_dict(guild))
+            self.assertEqual(
+                expected[0],
+                json.loads(serializer.to_json([guild]))[0]
+            )
+            self.assertRaises(
+                ValueError, serializer.to_dicts,
+                session.query(*serializer.get_query_fields())
+            )
+
+    def test_model_serializer_nested_contains_eager(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2)
+                for i in range(4)
+            ]
+            session.add_all(guilds)
+            for i, guild in enumerate(guilds[:3]):
+                guild.members.append(GuildMember(name='member{}'.format(i)))
+                guild.members.append(GuildMember(name='other{}'.format(i)))
+            session.commit()
+
+            expected = []
+            for guild in guilds:
+                guild_dict = guild.to_dict_with_hybrid()
+                guild_dict['members'] = [
+                    {'id': member.id, 'name': member.name, 'gold': 0}
+                    for member in guild.members
+                ]
+                expected.append(guild_dict)
+            session.expunge_all()
+
+            statements = []
+
+            def count_statement(*args):
+                statements.append(args)
+
+            serializer = GuildWithMembersEagerSerializer()
+            engine = get_engine()
+            event.listen(engine, 'before_cursor_execute', count_statement)
+            try:
+                serialized = serializer.to_dicts(
+                    serializer.build_query(session).order_by(
+                        Guild.id, GuildMember.id
+                    )
+                )
+            finally:
+                event.remove(engine, 'before_cursor_execute', count_statement)
+
+            self.assertEqual(expected, serialized)
+            self.assertEqual(1, len(statements))
+            self.assertEqual([Guild.members], serializer.get_eager_joins())
+
+            class MemberEagerSerializer(GuildMemberSerializer):
+                guild = SerializeNestedField(
+                    GuildModelSerializer, 'guild', load='contains_eager'
+                )
+
+            class BrokenSerializer(GuildModelSerializer):
+                members = SerializeNestedField(
+                    MemberEagerSerializer, 'members'
+                )
+
+            self.assertRaises(
+                ValueError, BrokenSerializer().build_query, session
+            )
+
+    def test_model_serializer_cache(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2)
+                for i in range(3)
+            ]
+            session.add_all(guilds)
+            session.commit()
+
+            cache = SerializationCache(maxsize=10)
+            cache.listen(session)
+            serializer = GuildModelSerializer(cache=cache)
+            stats = serializer.enable_stats()
+
+            def get_calls():
+                return stats.as_dict()['fields']['created_on']['calls']
+
+            expected = [guild.to_dict_with_hybrid() for guild in guilds]
+            self.assertEqual(expected[0], serializer.to_dict(guilds[0]))
+            self.assertEqual(expected, serializer.to_dicts(guilds))
+            self.assertEqual(3, get_calls())
+            self.assertEqual(expected, serializer.to_dicts(guilds))
+            self.assertEqual(expected[1], serializer.to_dict(guilds[1]))
+            self.assertEqual(3, get_calls())
+
+            # other serializer does not share entries
+            self.assertEqual(
+                [{'id': guild.id} for guild in guilds],
+                GuildModelSerializer(only=['id'], cache=cache).to_dicts(guilds)
+            )
+
+            serializer.to_dict(guilds[0])['gold'] = 1
+            self.assertEqual(expected[0], serializer.to_dict(guilds[0]))
+
+            guilds[0].gold = 100
+            session.commit()
+            self.assertEqual(100, serializer.to_dict(guilds[0])['gold'])
+            self.assertEqual(4, get_calls())
+
+            session.delete(guilds[1])
+            session.flush()
+            self.assertEqual(2, len(cache))
+
+    def test_model_serializer_cache_stale(self):
+        with create_session() as session:
+            guild = Guild(name='test', max_members=2)
+            session.add(guild)
+            session.commit()
+
+            cache = SerializationCache(maxsize=10)
+            cache.listen(session)
+            serializer = GuildModelSerializer(cache=cache)
+            self.assertEqual(0, serializer.to_dict(guild)['gold'])
+
+            # modified, not flushed instance
+            guild.gold = 5
+            self.assertEqual(5, serializer.to_dict(guild)['gold'])
+            self.assertEqual(5, serializer.to_dicts([guild])[0]['gold'])
+            session.commit()
+            self.assertEqual(5, serializer.to_dict(guild)['gold'])
+
+            # bulk updates, entries are not expired with instance
+            serializer.from_dicts(
+                session, [{'id': guild.id, 'gold': 42}], update=True
+            )
+            session.commit()
+            session.refresh(guild)
+            self.assertEqual(42, serializer.to_dict(guild)['gold'])
+
+            session.query(Guild).update({'gold': 43})
+            session.commit()
+            session.refresh(guild)
+            self.assertEqual(43, serializer.to_dict(guild)['gold'])
+
+            # dicts of related instances could not be invalidated
+            self.assertRaises(
+                ValueError, GuildWithMembersSerializer, cache=cache
+            )
+
+    def test_lru_cache(self):
+        now = [0]
+        cache = LRUCache(maxsize=2, ttl=10, timer=lambda: now[0])
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+
+        now[0] = 11
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(1, len(cache))
+
+    def test_model_serializer_sql_expressions(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2, level=i)
+                for i in range(3)
+            ]
+            session.add_all(guilds)
+            session.commit()
+
+            expected = []
+            for guild in guilds:
+                guild_dict = guild.to_dict_with_hybrid()
+                guild_dict['gold_and_level'] = gold_and_level(guild_dict)
+                expected.append(guild_dict)
+
+            serializer = GuildModelSqlCustomSerializer()
+            self.assertIn(
+                'gold_and_level',
+                [field.key for field in serializer.get_query_fields()]
+            )
+            stats = serializer.enable_stats()
+
+            query = session.query(Guild).order_by(Guild.id)
+            self.assertEqual(expected, serializer.to_dicts(query))
+            self.assertEqual(expected, list(serializer.iter_dicts(query)))
+            self.assertEqual(
+                expected,
+                json.loads(serializer.to_json(query).decode('utf-8'))
+            )
+            self.assertNotIn('gold_and_level', stats.as_dict()['fields'])
+
+            self.assertEqual(expected, serializer.to_dicts(query.all()))
+            self.assertEqual(expected[0], serializer.to_dict(guilds[0]))
+            self.assertEqual(
+                4, stats.as_dict()['fields']['gold_and_level']['calls']
+            )
+
+            header, rows = serializer.to_tuples(query.all())
+            self.assertEqual(expected, [dict(zip(header, row)) for row in rows])
+
+            serializer = GuildModelSerializer(prefer_sql_expressions=False)
+            self.assertEqual(
+                [guild.to_dict_with_hybrid() for guild in guilds],
+                serializer.to_dicts(query)
+            )
+
+    def test_model_serializer_single_field(self):
+        with create_session() as session:
+            acc1 = Guild(
+                name='test1',
+                max_members=2
+            )
+
+            session.add(acc1)
+            session.commit()
+
+            serializer = GuildSingleFieldSerializer()
+
+            data = session.query(
+                *serializer.get_query_fields()
+            ).first()
+            self.assertEqual({'name': 'test1'}, serializer.to_dict(data))
+
+            data = session.query(Guild).first()
+            self.assertEqual({'name': 'test1'}, serializer.to_dict(data))
+
+    def test_model_serializer_type_converters(self):
+        with create_session() as session:
+            guild = Guild(name='test1', max_members=2)
+            session.add(guild)
+            session.commit()
+
+            serializer = SQLAlchemyModelSerializator(model=Guild)
+            self.assertEqual(
+                guild.to_dict_with_hybrid(), serializer.to_dict(guild)
+            )
+            serializer = SQLAlchemyModelSerializator(
+                model=Guild, convert_types=False
+            )
+            self.assertEqual(
+                guild.created_on, serializer.to_dict(guild)['created_on']
+            )
+
+        converters = [
+            (types.Date(), datetime.date(2000, 1, 2), '2000-01-02'),
+            (types.Numeric(), decimal.Decimal('1.50'), '1.50'),
+            (types.LargeBinary(), b'\x00\x01', 'AAE='),
+            (
+                UUIDType(), uuid.UUID(int=1),
+                '00000000-0000-0000-0000-000000000001'
+            ),
+            (types.Time(), None, None),
+        ]
+        for column_type, value, expected in converters:
+            self.assertEqual(
+                expected, get_type_converter(column_type)(value)
+            )
+            self.assertEqual(
+                value, get_type_deserializer(column_type)(expected)
+            )
+        value = datetime.datetime(2000, 1, 2, 3, 4, 5, 6)
+        self.assertEqual(value, get_type_deserializer(types.DateTime())(
+            get_type_converter(types.DateTime())(value)
+        ))
+        for column_type in (types.Integer(), types.JSON(), types.Float()):
+            self.assertIsNone(get_type_converter(column_type))
+
+    def test_model_serializer_paginate(self):
+        with create_session() as session:
+            session.add_all([
+                Guild(name='test{}'.format(i), level=i % 3, max_members=2)
+                for i in range(7)
+            ])
+            session.commit()
+            guilds = session.query(Guild).order_by(Guild.id).all()
+
+            statements = []
+
+            def count_statement(*args):
+                statements.append(args)
+
+            serializer = GuildModelSerializer()
+            engine = get_engine()
+            event.listen(engine, 'before_cursor_execute', count_statement)
+            try:
+                pages = []
+                data, cursor = serializer.paginate(session, limit=3)
+                pages.append(data)
+                while cursor is not None:
+                    data, cursor = serializer.paginate(
+                        session, cursor=cursor, limit=3
+                    )
+                    pages.append(data)
+            finally:
+                event.remove(engine, 'before_cursor_execute', count_statement)
+            self.assertEqual([3, 3, 1], [len(page) for page in pages])
+            self.assertEqual(
+                [guild.to_dict_with_hybrid() for guild in guilds],
+                sum(pages, [])
+            )
+            self.assertEqual(3, len(statements))
+
+            order_by = (Guild.level, Guild.id)
+            expected = sorted(
+                guilds, key=lambda guild: (guild.level, guild.id)
+            )
+            serializer = GuildWithMembersSerializer()
+            data, cursor = serializer.paginate(
+                session, limit=4, order_by=order_by
+            )
+            self.assertEqual(
+                [guild.id for guild in expected[:4]],
+                [item['id'] for item in data]
+            )
+            data, cursor = serializer.paginate(
+                session.query(Guild).filter(Guild.level > 0),
+                cursor=cursor, limit=4, order_by=order_by
+            )
+            self.assertEqual(
+                [guild.id for guild in expected[4:]],
+                [item['id'] for item in data]
+            )
+            self.assertIsNone(cursor)
+
+            self.assertRaises(
+                ValueError, serializer.paginate, session, cursor='broken'
+            )
+            self.assertRaises(
+                ValueError, GuildSimpleSerializer().paginate, session
+            )
+
+            # values of cursor are converted by column types
+            order_by = (Guild.created_on, Guild.id)
+            pages = []
+            cursor = None
+            while True:
+                data, cursor = GuildModelSerializer().paginate(
+                    session, cursor=cursor, limit=3, order_by=order_by
+                )
+                pages.append([item['id'] for item in data])
+                if cursor is None:
+                    break
+            self.assertEqual(
+                [guild.id for guild in sorted(
+                    guilds, key=lambda guild: (guild.created_on, guild.id)
+                )],
+                sum(pages, [])
+            )
+            self.assertEqual(3, len(pages))
+
+            # order of query is replaced with keyset order
+            data, cursor = GuildModelSerializer().paginate(
+                serializer.build_query(session).order_by(Guild.level),
+                limit=4
+            )
+            self.assertEqual(
+                [guild.id for guild in guilds[:4]],
+                [item['id'] for item in data]
+            )
+
+    def test_model_serializer_with_fields(self):
+        with create_session() as session:
+            session.add_all([
+                Guild(name='test{}'.format(i), gold=i, max_members=2)
+                for i in range(3)
+            ])
+            session.commit()
+            guilds = session.query(Guild).order_by(Guild.id).all()
+            guild = guilds[0]
+            guild.add_member(name='member', session=session)
+            session.commit()
+
+            serializer = GuildWithMembersSerializer()
+            narrow = serializer.with_fields('id', 'name')
+            self.assertIs(narrow, serializer.with_fields('name', 'id'))
+            self.assertEqual(2, len(narrow.get_query_fields()))
+            query = narrow.build_query(session).order_by(Guild.id)
+            self.assertEqual(
+                [{'id': item.id, 'name': item.name} for item in guilds],
+                narrow.to_dicts(query)
+            )
+            self.assertEqual(
+                {'id': guild.id, 'name': guild.name}, narrow.to_dict(guild)
+            )
+            self.assertEqual(
+                ('id',), narrow.with_fields('id').get_result_keys()
+            )
+            self.assertRaises(ValueError, narrow.with_fields, 'gold')
+
+            nested = serializer.with_fields('id', 'members')
+            self.assertEqual(
+                {'id': guild.id, 'members': [{
+                    'id': guild.members[0].id,
+                    'name': 'member',
+                    'gold': 0,
+                    'guild': guild.to_dict_with_hybrid(),
+                }]},
+                nested.to_dict(guild)
+            )
+            self.assertEqual(
+                guild.to_dict_with_hybrid(),
+                dict(
+                    (key, value) for key, value in
+                    serializer.to_dict(guild).items()
+                    if key != 'members'
+                )
+            )
+
+            # dependencies of custom fields are selected, but not returned
+            expected = [
+                {'gold_and_level': gold_and_level(item.to_dict())}
+                for item in guilds
+            ]
+            custom = GuildCustomSerializer().with_fields('gold_and_level')
+            self.assertEqual(('gold_and_level',), custom.get_result_keys())
+            self.assertEqual(2, len(custom.get_query_fields()))
+            query = custom.build_query(session).order_by(Guild.id)
+            self.assertEqual(expected, custom.to_dicts(query))
+            self.assertEqual(expected[0], custom.to_dict(query.first()))
+            self.assertEqual(
+                (
+                    ('gold_and_level',),
+                    [(item['gold_and_level'],) for item in expected]
+                ),
+                custom.to_tuples(query)
+            )
+            self.assertEqual(expected, json.loads(custom.to_json(query)))
+
+            sql_custom = GuildModelSqlCustomSerializer().with_fields(
+                'gold_and_level'
+            )
+            self.assertEqual(expected[0], sql_custom.to_dict(guild))
+            self.assertEqual(expected, sql_custom.to_dicts(guilds))
+
+            # custom field without depends selects all fields
+            full = GuildModelCustomSerializer().with_fields(
+                'id', 'gold_and_level'
+            )
+            self.assertEqual(('id', 'gold_and_level'), full.get_result_keys())
+            self.assertEqual(
+                dict(expected[0], id=guild.id), full.to_dict(guild)
+            )
+            self.assertRaises(ValueError, serializer.with_fields, 'unknown')
+
+            # derived serializers don't share cache of parent
+            serializer.with_fields('id')
+            self.assertRaises(
+                ValueError, serializer.with_fields('name').with_fields, 'id'
+            )
+
+    def test_model_serializer_from_dicts_type_converters(self):
+        with create_session() as session:
+            session.add_all([
+                Guild(name='test{}'.format(i), gold=i, max_members=2)
+                for i in range(3)
+            ])
+            session.commit()
+
+            # no deserialize_<key> methods
+            serializer = SQLAlchemyModelSerializator(model=Guild)
+            query = session.query(Guild).order_by(Guild.id)
+            dicts = serializer.to_dicts(query)
+            session.query(Guild).delete()
+            session.commit()
+
+            self.assertEqual(3, serializer.from_dicts(session, dicts))
+            session.commit()
+            self.assertEqual(dicts, serializer.to_dicts(query))
+
+            serializer.from_dicts(session, dicts, update=True)
+            session.commit()
+            self.assertEqual(dicts, serializer.to_dicts(query))
+
+    def test_model_serializer_from_dicts(self):
+        with create_session() as session:
+            session.add_all([
+                Guild(name='test{}'.format(i), gold=i, max_members=2)
+                for i in range(5)
+            ])
+            session.commit()
+
+            serializer = GuildModelSerializer()
+            query = session.query(Guild).order_by(Guild.id)
+            dicts = serializer.to_dicts(query)
+            session.query(Guild).delete()
+            session.commit()
+
+            statements = []
+
+            def count_statement(*args):
+                statements.append(args)
+
+            engine = get_engine()
+            event.listen(engine, 'before_cursor_execute', count_statement)
+            try:
+                count = serializer.from_dicts(session, dicts, batch_size=2)
+            finally:
+                event.remove(engine, 'before_cursor_execute', count_statement)
+            session.commit()
+            self.assertEqual(5, count)
+            self.assertEqual(3, len(statements))
+            self.assertEqual(dicts, serializer.to_dicts(query))
+
+            for data in dicts:
+                data['gold'] += 100501
+            serializer.from_dicts(
+                session,
+                [dict(id=data['id'], gold=data['gold']) for data in dicts],
+                update=True
+            )
+            session.commit()
+            session.expire_all()
+            for data in dicts:
+                data['is_rich'] = True
+            self.assertEqual(dicts, serializer.to_dicts(query))
+
+            serializer.from_dicts(
+                session, [{'name': 'test5', 'gold': 1, 'max_members': 2}]
+            )
+            self.assertEqual(6, query.count())
+            self.assertRaises(
+                ValueError, serializer.from_dicts,
+                session, [{'name': 'test6', 'unknown': 1}]
+            )
+            self.assertRaises(
+                ValueError, serializer.from_dicts,
+                session, [{'gold': 1}], update=True
+            )
     # test with simple fields switched off inspection
     # test hybrid fields without label
 
+
+class TestSequence(BaseTest):
+    def test_sequence(self):
+        with create_session() as session:
+            guilds = [
+                Guild(name='test{}'.format(i), max_members=2)
+                for i in range(3)
+            ]
+            session.add_all(guilds)
+            for i, guild in enumerate(guilds[:2]):
+                guild.members.append(GuildMember(name='member{}'.format(i)))
+                guild.members.append(GuildMember(name='other{}'.format(i)))
+            session.commit()
+
+            member_serializer = GuildMemberSerializer()
+            sequence = Sequence(
+                GuildCustomSerializer(), member_serializer, 'members'
+            )
+            self.assertEqual('id', sequence.index_key)
+
+            query = session.query(
+                *sequence.get_query_fields()
+            ).outerjoin(Guild.members).order_by(GuildMember.id.desc())
+
+            expected = []
+            for guild in guilds:
+                guild_dict = guild.to_dict()
+                guild_dict['gold_and_level'] = gold_and_level(guild_dict)
+                guild_dict['members'] = sorted(
+                    list(map(member_serializer.to_dict, guild.members)),
+                    key=lambda member: -member['id']
+                )
+                expected.append(guild_dict)
+
+            serialized = sorted(
+                sequence.to_dicts(query), key=lambda guild: guild['id']
+            )
+            self.assertEqual(expected, serialized)
+            self.assertEqual([], sequence.to_dicts([]))
+
+            sequence = Sequence(
+                GuildModelSerializer(), member_serializer, 'members'
+            )
+            self.assertEqual('id', sequence.index_key)
+            self.assertRaises(
+                ValueError, Sequence,
+                GuildModelSerializer(exclude=['id']),
+                member_serializer, 'members'
+            )
+
+
+class TestRegistry(BaseTest):
+    def test_registry(self):
+        with create_session() as session:
+            guild = Guild(name='test', max_members=2)
+            session.add(guild)
+            session.flush()
+            guild.add_member(name='member1', session=session)
+            guild.add_member(name='member2', session=session)
+            session.commit()
+            members = guild.members
+
+            registry = SerializerRegistry()
+            registry.register(GuildModelSerializer)
+            member_serializer = registry.register(
+                GuildMemberSerializer(), model=Base
+            )
+            self.assertIs(member_serializer, registry.get(GuildMember))
+            self.assertIsInstance(registry.get(Guild), GuildModelSerializer)
+
+            member_dicts = member_serializer.to_dicts(members)
+            self.assertEqual(
+                [guild.to_dict_with_hybrid(), member_dicts[0], None,
+                 member_dicts[1]],
+                registry.to_dicts([guild, members[0], None, members[1]])
+            )
+            self.assertEqual(
+                member_dicts[0], registry.to_dict(members[0])
+            )
+
+            query = session.query(Guild, GuildMember).join(
+                GuildMember.guild
+            ).order_by(GuildMember.id)
+            self.assertEqual(
+                [
+                    (guild.to_dict_with_hybrid(), member_dicts[0]),
+                    (guild.to_dict_with_hybrid(), member_dicts[1]),
+                ],
+                registry.to_dicts(query)
+            )
+
+            registry.unregister(Base)
+            self.assertRaises(ValueError, registry.get, GuildMember)
+
+
+class SavepointTest(BaseTest):
+    def setUp(self):
+        # pysqlite does not begin transactions itself,
+        # so savepoints need explicit BEGIN
+        session_module.configure()
+        engine = get_engine()
+        event.listen(engine, 'connect', self.disable_pysqlite_begin)
+        event.listen(engine, 'begin', self.begin)
+        super(SavepointTest, self).setUp()
+
+    def tearDown(self):
+        super(SavepointTest, self).tearDown()
+        session_module.configure()
+
+    def disable_pysqlite_begin(self, connection, record):
+        connection.isolation_level = None
+
+    def begin(self, connection):
+        connection.execute('BEGIN')
+
+
+class TestDelta(SavepointTest):
+    def test_to_delta(self):
+        with create_session() as session:
+            guild = Guild(name='test', max_members=2)
+            session.add(guild)
+            session.commit()
+
+            serializer = GuildModelSerializer()
+            self.assertIsNone(serializer.to_delta(guild))
+
+            guild.level = guild.level
+            guild.gold = 100501
+            self.assertEqual(
+                {'id': guild.id, 'gold': 100501, 'is_rich': True},
+                serializer.to_delta(guild)
+            )
+            self.assertEqual({'id': guild.id}, serializer.to_identity(guild))
+            session.commit()
+            self.assertIsNone(serializer.to_delta(guild))
+
+            custom = GuildModelSqlCustomSerializer(exclude=['is_rich'])
+            session.refresh(guild)
+            guild.level = 3
+            # gold is passed to gold_and_level, but is not in delta
+            self.assertEqual(
+                {'id': guild.id, 'level': 3, 'gold_and_level': '100501: 3'},
+                custom.to_delta(guild)
+            )
+
+            # custom field without depends is computed from the whole raw
+            custom = GuildModelCustomSerializer()
+            guild.level = 4
+            self.assertEqual(
+                {
+                    'id': guild.id, 'level': 4, 'is_rich': True,
+                    'gold_and_level': '100501: 4',
+                },
+                custom.to_delta(guild)
+            )
+
+    def test_delta_collector(self):
+        registry = SerializerRegistry()
+        registry.register(GuildModelSerializer)
+        registry.register(GuildMemberSerializer)
+        collector = DeltaCollector(registry)
+
+        with create_session() as session:
+            collector.listen(session)
+
+            guild = Guild(name='test', max_members=2)
+            session.add(guild)
+            member = guild.add_member(name='member', session=session)
+            session.commit()
+            deltas = collector.pop(session)
+            self.assertEqual(
+                [
+                    (Guild, 'insert', guild.to_dict_with_hybrid()),
+                    (
+                        GuildMember, 'insert',
+                        {'id': member.id, 'name': 'member', 'gold': 0}
+                    ),
+                ],
+                sorted(deltas, key=lambda delta: delta[0].__name__)
+            )
+
+            guild.gold = 10
+            member.gold = 5
+            session.flush()
+            session.delete(member)
+            session.commit()
+            self.assertEqual(
+                [
+                    (
+                        Guild, 'update',
+                        {'id': guild.id, 'gold': 10, 'is_rich': False}
+                    ),
+                    (GuildMember, 'update', {'id': member.id, 'gold': 5}),
+                    (GuildMember, 'delete', {'id': member.id}),
+                ],
+                sorted(collector.pop(session), key=lambda delta: (
+                    delta[0].__name__, delta[1] == 'delete'
+                ))
+            )
+            self.assertEqual([], collector.pop(session))
+
+            guild.gold = 20
+            session.flush()
+            session.rollback()
+            self.assertEqual([], collector.pop(session))
+
+    def test_delta_collector_savepoint(self):
+        registry = SerializerRegistry()
+        registry.register(GuildModelSerializer)
+        collector = DeltaCollector(registry)
+
+        with create_session() as session:
+            collector.listen(session)
+
+            guild = Guild(name='a', max_members=2)
+            session.add(guild)
+            session.flush()
+            inserted = guild.to_dict_with_hybrid()
+            guild.gold = 10
+            session.flush()
+
+            session.begin_nested()
+            session.add(Guild(name='b', max_members=2))
+            guild.gold = 20
+            session.flush()
+            session.rollback()
+
+            session.commit()
+            self.assertEqual(
+                [
+                    (Guild, 'insert', inserted),
+                    (
+                        Guild, 'update',
+                        {'id': guild.id, 'gold': 10, 'is_rich': False}
+                    ),
+                ],
+                collector.pop(session)
+            )
+            self.assertEqual(10, guild.gold)
+
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.connection_string = 'sqlite:///{}'.format(
+            os.path.join(self.directory, 'test.db')
+        )
+
+    def tearDown(self):
+        session_module.configure()
+        shutil.rmtree(self.directory)
+
+    def test_configure(self):
+        session_module.configure(
+            connection_string=self.connection_string,
+            poolclass=QueuePool, pool_size=2, max_overflow=0,
+            pool_pre_ping=True
+        )
+        engine = get_engine()
+        self.assertIs(engine, get_engine())
+        self.assertFalse(engine.echo)
+        self.assertEqual(2, engine.pool.size())
+
+        metadata.create_all(engine)
+        with create_session() as session:
+            session.add(Guild(name='test', max_members=2))
+            session.commit()
+        with create_session() as session:
+            self.assertEqual(1, session.query(Guild).count())
+        self.assertEqual(0, engine.pool.checkedout())
+
+        session_module.configure(connection_string=self.connection_string)
+        self.assertIsNot(engine, get_engine())
+        with create_session() as session:
+            self.assertEqual(1, session.query(Guild).count())
+
+    def test_scoped(self):
+        session_module.configure(
+            connection_string=self.connection_string, scoped=True
+        )
+        metadata.create_all(get_engine())
+        with create_session() as session:
+            self.assertIs(session, create_session(context_manager=False))
+            pool = ThreadPool(1)
+            other = pool.apply(
+                create_session, kwds={'context_manager': False}
+            )
+            pool.close()
+            self.assertIsNot(session, other)
+        self.assertIsNot(session, create_session(context_manager=False))
+
+
+class TestSessioned(SavepointTest):
+    def setUp(self):
+        super(TestSessioned, self).setUp()
+        self.commits = []
+        event.listen(Session, 'after_commit', self.record_commit)
+
+    def tearDown(self):
+        event.remove(Session, 'after_commit', self.record_commit)
+        super(TestSessioned, self).tearDown()
+
+    def record_commit(self, session):
+        self.commits.append(session)
+
+    def test_commit(self):
+        with create_session() as session:
+            guild = Guild(name='test', max_members=2)
+            session.add(guild)
+            session.commit()
+
+            guild.add_member(name='member1', session=session)
+            self.assertEqual(1, len(self.commits))
+            guild.add_member(name='member2', session=session, commit=True)
+            self.assertEqual(2, len(self.commits))
+
+        guild.add_member(name='member3', commit=True)
+        self.assertEqual(3, len(self.commits))
+
+        with create_session() as session:
+            self.assertEqual(
+                ['member1', 'member2', 'member3'],
+                [member.name for member in session.query(GuildMember)]
+            )
+
+    def test_scope(self):
+        with sessioned.scope(commit=True) as session:
+            guild = Guild(name='test', max_members=2)
+            session.add(guild)
+            for i in range(5):
+                member = guild.add_member(
+                    name='member{}'.format(i), commit=True
+                )
+                self.assertIs(session, inspect(member).session)
+            guild.add_member(name='member5', session=session, commit=True)
+            self.assertEqual([], self.commits)
+        self.assertEqual(1, len(self.commits))
+
+        with create_session() as session:
+            self.assertEqual(6, session.query(GuildMember).count())
+
+    def test_explicit_session(self):
+        @sessioned
+        def add_guild(name, session=None, commit=None):
+            guild = Guild(name=name, max_members=2)
+            session.add(guild)
+            member = guild.add_member(name=name, commit=True)
+            self.assertIs(session, inspect(member).session)
+            return guild
+
+        with create_session() as session:
+            add_guild('first', session=session)
+            self.assertEqual(1, len(self.commits))
+            add_guild('second', session=session, commit=False)
+            self.assertEqual(2, len(self.commits))
+
+        with create_session() as session:
+            self.assertEqual(2, session.query(GuildMember).count())
+
+    def test_scope_rollback(self):
+        with self.assertRaises(ZeroDivisionError):
+            with sessioned.scope(commit=True) as session:
+                guild = Guild(name='test', max_members=2)
+                session.add(guild)
+                guild.add_member(name='member', commit=True)
+                1 / 0
+        self.assertEqual([], self.commits)
+
+        with create_session() as session:
+            self.assertEqual(0, session.query(Guild).count())
+
+    def test_savepoint(self):
+        @sessioned
+        def add_broken_member(guild, session=None, commit=None):
+            guild.add_member(name='broken', session=session)
+            session.flush()
+            raise ValueError()
+
+        with sessioned.scope(commit=True) as session:
+            guild = Guild(name='test', max_members=2)
+            session.add(guild)
+            guild.add_member(name='member')
+            with self.assertRaises(ValueError):
+                add_broken_member(guild, savepoint=True)
+        self.assertEqual(1, len(self.commits))
+
+        with create_session() as session:
+            self.assertEqual(
+                ['member'],
+                [member.name for member in session.query(GuildMember)]
+            )
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_benchmarks(self):
+        from .benchmarks import bench_to_dict, get_to_dict_cases
+
+        results = bench_to_dict(counts=(10,))
+        self.assertEqual(len(get_to_dict_cases()), len(results))
+        for name, count, speed, allocated in results:
+            self.assertEqual(10, count)
+            self.assertTrue(speed > 0)
+
+    def test_import_benchmark(self):
+        from .benchmarks import bench_import
+
+        results = bench_import()
+        if results is None:
+            self.skipTest('-X importtime is not supported')
+        modules = [module for module, own, cumulative in results]
+        self.assertIn('sqlalchemy_serializer.serializers', modules)
+        # optional modules are imported on use
+        for module in ('aio', 'delta', 'parallel', 'registry'):
+            self.assertNotIn('sqlalchemy_serializer.' + module, modules)
+        # own code of package is a small part of import with sqlalchemy
+        own = sum(own for module, own, cumulative in results)
+        total = max(cumulative for module, own, cumulative in results)
+        self.assertLess(own, total * 0.1)
+
+
+class TestImport(unittest.TestCase):
+    def test_import_is_side_effect_free(self):
+        code = '\n'.join([
+            'import sys',
+            'import sqlalchemy_serializer.serializers',
+            'from sqlalchemy_serializer import session',
+            'assert session._engine is None',
+            'assert session._session_factory is None',
+            'assert "sqlalchemy_utils" not in sys.modules',
+            'assert "multiprocessing" not in sys.modules',
+        ])
+        subprocess.check_call(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+
 if __name__ == '__main__':
     unittest.main()
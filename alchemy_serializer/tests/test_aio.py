@@ -0,0 +1,7 @@
+"""
+Asyncio tests, see aio_cases.
+"""
+import sys
+
+if sys.version_info >= (3, 7):
+    from .aio_cases import TestAsync  # noqa